@@ -0,0 +1,89 @@
+"""
+Measure login throughput and event-loop responsiveness of a running server.
+
+Usage:
+    python benchmark_login.py                          # http://127.0.0.1:8000, 200 logins, 16 concurrent
+    python benchmark_login.py http://host:8000 500 32
+
+Registers a benchmark user (if needed), then fires concurrent logins at
+/api/token while probing /api/ping in the background. A server that runs
+bcrypt on the event loop shows ping latency in the hundreds of
+milliseconds under login load; with bcrypt on its own pool, pings stay
+fast while logins are bounded by BCRYPT_WORKERS.
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+
+BENCH_EMAIL = "login-benchmark@example.com"
+BENCH_PASSWORD = "login-benchmark-password"
+PING_INTERVAL = 0.05
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+async def probe_pings(client, stop, latencies):
+    """Ping at a fixed interval until stopped; records round-trip times"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/api/ping")
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(PING_INTERVAL)
+
+
+async def run(base_url, total, concurrency):
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        response = await client.post("/api/register", json={"email": BENCH_EMAIL, "password": BENCH_PASSWORD})
+        if response.status_code not in (200, 400):  # 400: already registered
+            response.raise_for_status()
+
+        idle = []
+        stop = asyncio.Event()
+        prober = asyncio.create_task(probe_pings(client, stop, idle))
+        await asyncio.sleep(1)
+        stop.set()
+        await prober
+
+        semaphore = asyncio.Semaphore(concurrency)
+        login_times = []
+
+        async def login():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post("/api/token", data={"username": BENCH_EMAIL, "password": BENCH_PASSWORD})
+                response.raise_for_status()
+                login_times.append(time.perf_counter() - start)
+
+        loaded = []
+        stop = asyncio.Event()
+        prober = asyncio.create_task(probe_pings(client, stop, loaded))
+        start = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(total)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await prober
+
+    print(f"🔐 {total} logins, {concurrency} concurrent, against {base_url}")
+    print("=" * 60)
+    print(f"✅ Throughput: {total / elapsed:.1f} logins/s ({elapsed:.2f}s total)")
+    print(f"⏱️ Login latency: p50 {statistics.median(login_times) * 1000:.0f} ms, "
+          f"p99 {percentile(login_times, 0.99) * 1000:.0f} ms")
+    print(f"📡 Ping idle:     p50 {statistics.median(idle) * 1000:.1f} ms, p99 {percentile(idle, 0.99) * 1000:.1f} ms")
+    print(f"📡 Ping at load:  p50 {statistics.median(loaded) * 1000:.1f} ms, p99 {percentile(loaded, 0.99) * 1000:.1f} ms")
+
+
+def main():
+    base_url = sys.argv[1] if len(sys.argv) > 1 else "http://127.0.0.1:8000"
+    total = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 16
+    asyncio.run(run(base_url, total, concurrency))
+
+
+if __name__ == "__main__":
+    main()
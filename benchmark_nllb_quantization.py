@@ -0,0 +1,114 @@
+"""
+Compare NLLB translation speed and quality between fp32 and a quantized mode.
+
+Usage:
+    python benchmark_nllb_quantization.py            # fp32 vs int8
+    python benchmark_nllb_quantization.py bf16       # fp32 vs bf16
+
+Translates the bundled sample set (benchmark_data/nllb_samples.tsv) with
+both models and reports throughput plus BLEU/chrF against the references
+and the delta between modes, per language pair and overall.
+"""
+import csv
+import os
+import sys
+import time
+from collections import defaultdict
+
+# The baseline is always fp32; the quantized model is built explicitly below
+os.environ["NLLB_QUANTIZE"] = "none"
+
+import sacrebleu
+import torch
+from pipeline.translator import load_nllb_model, model_nllb, tokenizer
+
+SAMPLES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_data", "nllb_samples.tsv")
+WARMUP_SENTENCES = 2
+
+
+def load_samples(path=SAMPLES_PATH):
+    with open(path, encoding="utf-8") as f:
+        return list(csv.DictReader(f, delimiter="\t"))
+
+
+def translate_all(model, samples):
+    """Translate every sample one at a time; returns (outputs, seconds)"""
+    def run(sample):
+        tokenizer.src_lang = sample["source_lang"]
+        inputs = tokenizer(sample["source"], return_tensors="pt")
+        with torch.inference_mode():
+            tokens = model.generate(
+                **inputs,
+                forced_bos_token_id=tokenizer.lang_code_to_id[sample["target_lang"]],
+                max_new_tokens=inputs["input_ids"].shape[1] * 2 + 16
+            )
+        return tokenizer.batch_decode(tokens, skip_special_tokens=True)[0]
+
+    for sample in samples[:WARMUP_SENTENCES]:
+        run(sample)
+
+    start = time.perf_counter()
+    outputs = [run(sample) for sample in samples]
+    return outputs, time.perf_counter() - start
+
+
+def score(samples, outputs):
+    """BLEU and chrF per language pair and overall"""
+    by_pair = defaultdict(lambda: ([], []))
+    for sample, output in zip(samples, outputs):
+        hyps, refs = by_pair[f"{sample['source_lang']}->{sample['target_lang']}"]
+        hyps.append(output)
+        refs.append(sample["reference"])
+    by_pair["overall"] = (outputs, [sample["reference"] for sample in samples])
+
+    return {
+        pair: (sacrebleu.corpus_bleu(hyps, [refs]).score, sacrebleu.corpus_chrf(hyps, [refs]).score)
+        for pair, (hyps, refs) in by_pair.items()
+    }
+
+
+def model_megabytes(model):
+    """Size of the saved weights (quantized Linear layers store a packed (weight, bias) tuple)"""
+    total = 0
+    for value in model.state_dict().values():
+        for t in (value if isinstance(value, tuple) else (value,)):
+            if torch.is_tensor(t):
+                total += t.numel() * t.element_size()
+    return total / 2**20
+
+
+def main():
+    mode = sys.argv[1] if len(sys.argv) > 1 else "int8"
+    samples = load_samples()
+    print(f"🧪 NLLB fp32 vs {mode} on {len(samples)} sentences")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    quantized = load_nllb_model(mode)
+    print(f"⏱️ {mode} model ready in {time.perf_counter() - start:.1f}s")
+
+    results = {}
+    for name, model in (("fp32", model_nllb), (mode, quantized)):
+        outputs, seconds = translate_all(model, samples)
+        results[name] = {
+            "seconds": seconds,
+            "scores": score(samples, outputs),
+            "size_mb": model_megabytes(model),
+        }
+        print(f"✅ {name}: {seconds:.2f}s total, {len(samples) / seconds:.2f} sentences/s, "
+              f"{results[name]['size_mb']:.0f} MB weights")
+
+    base, quant = results["fp32"], results[mode]
+    print("\n" + "=" * 60)
+    print(f"{'pair':<22}{'BLEU fp32':>10}{'BLEU ' + mode:>11}{'ΔBLEU':>8}{'chrF fp32':>11}{'chrF ' + mode:>11}{'ΔchrF':>8}")
+    for pair, (bleu, chrf) in base["scores"].items():
+        q_bleu, q_chrf = quant["scores"][pair]
+        print(f"{pair:<22}{bleu:>10.1f}{q_bleu:>11.1f}{q_bleu - bleu:>+8.1f}{chrf:>11.1f}{q_chrf:>11.1f}{q_chrf - chrf:>+8.1f}")
+
+    print("-" * 60)
+    print(f"🚀 Speedup: {base['seconds'] / quant['seconds']:.2f}x")
+    print(f"💾 Weights: {base['size_mb']:.0f} MB -> {quant['size_mb']:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
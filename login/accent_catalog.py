@@ -0,0 +1,110 @@
+"""
+Accent catalog versions for conditional GETs.
+
+A user's catalog version is derived from their accent storage
+(accent_lib/<username>): the names, sizes and mtimes of the stored clips
+plus the mtimes of the directories holding them. Every worker process sees
+the same files, so they all compute the same ETag, and a change made
+through one worker is visible to the others immediately. A poll with a
+matching If-None-Match is answered with 304 after a couple of stat calls,
+without touching the database.
+
+Changes that are committed to the database after the files were written
+(saving or deleting a named accent) call bump(), which touches the user's
+directory, so the version also moves once the rows are visible.
+
+Catalogs are keyed by the storage username (see email_to_username in
+main.py), so differently cased spellings of an email share one version.
+"""
+
+import hashlib
+import os
+import threading
+from email.utils import formatdate
+
+ACCENT_LIB_DIR = "accent_lib"
+
+
+class AccentCatalog:
+    """Storage-derived catalog versions and cached accent-language listings, per user"""
+
+    def __init__(self, root: str = ACCENT_LIB_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+        self._languages = {}
+
+    def _directories(self, username: str) -> tuple:
+        user_dir = os.path.join(self.root, username)
+        return user_dir, os.path.join(user_dir, "saved_accents")
+
+    def version(self, username: str) -> tuple:
+        """(version, last modified timestamp) of a user's catalog"""
+        digest = hashlib.sha1()
+        modified = 0.0
+        for directory in self._directories(username):
+            try:
+                stat = os.stat(directory)
+                entries = sorted(
+                    (entry.name, entry.stat()) for entry in os.scandir(directory) if entry.is_file()
+                )
+            except FileNotFoundError:
+                digest.update(b"-")
+                continue
+            digest.update(f"{directory}:{stat.st_mtime_ns}".encode())
+            modified = max(modified, stat.st_mtime)
+            for name, entry_stat in entries:
+                digest.update(f"{name}:{entry_stat.st_size}:{entry_stat.st_mtime_ns}".encode())
+                modified = max(modified, entry_stat.st_mtime)
+        return digest.hexdigest()[:16], modified
+
+    def bump(self, username: str) -> None:
+        """Move the version after a change that is not visible in the files themselves"""
+        user_dir, _ = self._directories(username)
+        os.makedirs(user_dir, exist_ok=True)
+        os.utime(user_dir)
+
+    def validators(self, username: str, *variant) -> tuple:
+        """
+        (weak ETag, response headers) for the current version; variant
+        distinguishes e.g. pages of one listing
+        """
+        version, modified = self.version(username)
+        tag = version
+        if variant:
+            tag += "-" + hashlib.sha1(repr(variant).encode()).hexdigest()[:12]
+        etag = f'W/"{tag}"'
+        return etag, {
+            "ETag": etag,
+            "Last-Modified": formatdate(modified, usegmt=True),
+            "Cache-Control": "no-cache",
+        }
+
+    def languages(self, username: str, load) -> list:
+        """The user's accent-language listing, reloaded only when the version changes"""
+        version, _ = self.version(username)
+        with self._lock:
+            cached = self._languages.get(username)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        # Load outside the lock; a change meanwhile just forces another reload
+        listing = load()
+        with self._lock:
+            self._languages[username] = (version, listing)
+        return listing
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match comparison (weak, as for GET requests)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return _opaque_tag(etag) in {_opaque_tag(tag) for tag in if_none_match.split(",")}
+
+
+def _opaque_tag(tag: str) -> str:
+    return tag.strip().removeprefix("W/")
+
+
+accent_catalog = AccentCatalog()
@@ -3,10 +3,16 @@ from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from datetime import datetime, timedelta, timezone
-from login.database import get_db
+from login.database import get_async_db
 from login.models import User
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import os
+import threading
+import time
 
 # only for dev
 from dotenv import load_dotenv
@@ -21,11 +27,30 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 180  # 3 hours
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# bcrypt takes ~250 ms of CPU per hash; run it off the event loop on a
+# bounded pool so a burst of logins queues instead of stalling every request
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", "2"))
+_bcrypt_executor = ThreadPoolExecutor(max_workers=BCRYPT_WORKERS, thread_name_prefix="bcrypt")
+
+# How long a validated token is trusted without looking the user up again
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "60"))
+AUTH_CACHE_ITEMS = int(os.getenv("AUTH_CACHE_ITEMS", "10000"))
+
 
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def hash_password_async(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(_bcrypt_executor, pwd_context.hash, password)
+
+
+async def verify_password_async(plain_password, hashed_password) -> bool:
+    return await asyncio.get_running_loop().run_in_executor(
+        _bcrypt_executor, verify_password, plain_password, hashed_password
+    )
+
+
 def get_user(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
@@ -38,6 +63,112 @@ def authenticate_user(db: Session, email: str, password: str):
     return user
 
 
+async def get_user_async(db: AsyncSession, email: str):
+    return (await db.execute(select(User).where(User.email == email))).scalar_one_or_none()
+
+
+async def authenticate_user_async(db: AsyncSession, email: str, password: str):
+    """authenticate_user for async sessions, with the bcrypt check on the bcrypt pool"""
+    user = await get_user_async(db, email)
+    if not user:
+        return False
+    if not await verify_password_async(password, user.hashed_password):
+        return False
+    return user
+
+
+class UserIdentity:
+    """Session-independent snapshot of the User fields protected routes use"""
+
+    def __init__(self, user: User):
+        self.id = user.id
+        self.email = user.email
+        self.username = user.username
+        self.is_active = user.is_active
+
+
+class IdentityCache:
+    """
+    Token -> UserIdentity cache with a short TTL.
+
+    Entries for a user are dropped as soon as that user row is inserted,
+    updated or deleted (see the mapper events below), so the TTL only bounds
+    how long changes made outside this process can go unnoticed.
+    """
+
+    def __init__(self, ttl: float = AUTH_CACHE_TTL, max_items: int = AUTH_CACHE_ITEMS):
+        self.ttl = ttl
+        self.max_items = max_items
+        self._entries = {}
+        self._tokens_by_email = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str):
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            identity, expires_at = entry
+            if expires_at < time.monotonic():
+                self._drop(token)
+                self.misses += 1
+                return None
+            self.hits += 1
+            return identity
+
+    def put(self, token: str, identity: UserIdentity) -> None:
+        with self._lock:
+            if len(self._entries) >= self.max_items:
+                self._expire()
+            if len(self._entries) >= self.max_items:
+                # Still full of live entries: drop the oldest
+                self._drop(next(iter(self._entries)))
+            self._entries[token] = (identity, time.monotonic() + self.ttl)
+            self._tokens_by_email.setdefault(identity.email, set()).add(token)
+
+    def invalidate(self, email: str) -> None:
+        with self._lock:
+            for token in self._tokens_by_email.pop(email, ()):
+                self._entries.pop(token, None)
+
+    def _drop(self, token):
+        identity, _ = self._entries.pop(token)
+        tokens = self._tokens_by_email.get(identity.email)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_email[identity.email]
+
+    def _expire(self):
+        now = time.monotonic()
+        for token in [token for token, (_, expires_at) in self._entries.items() if expires_at < now]:
+            self._drop(token)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "tokens": len(self._entries),
+        }
+
+
+identity_cache = IdentityCache()
+
+
+@event.listens_for(User, "after_insert")
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_identity(mapper, connection, user):
+    # A changed email also invalidates tokens issued for the old one
+    for email in {user.email, *inspect(user).attrs.email.history.deleted}:
+        identity_cache.invalidate(email)
+
+
 def create_access_token(data: dict, expires_delta=None):
     to_encode = data.copy()
     # expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
@@ -47,7 +178,7 @@ def create_access_token(data: dict, expires_delta=None):
 
 async def validate_and_get_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -55,6 +186,11 @@ async def validate_and_get_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    # Recently validated tokens skip decoding and the database lookup
+    identity = identity_cache.get(token)
+    if identity is not None:
+        return identity
+
     try:
         # 1. Verify token signature and expiration
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -70,11 +206,13 @@ async def validate_and_get_user(
         if email is None:
             raise credentials_exception
 
-        user = db.query(User).filter(User.email == email).first()
+        user = await get_user_async(db, email)
         if user is None:
             raise credentials_exception
 
-        return user
+        identity = UserIdentity(user)
+        identity_cache.put(token, identity)
+        return identity
 
     except JWTError:
         raise credentials_exception
@@ -0,0 +1,45 @@
+"""
+Add the reference clip/transcript columns to saved_accents and fill them
+for accents saved before they existed.
+
+Usage: python -m login.backfill_accent_references
+"""
+import os
+from sqlalchemy import inspect, text
+from login.database import engine, SessionLocal
+from login.models import SavedAccent
+from pipeline.f5tts_synthesizer import prepare_reference_or_none
+
+
+def add_reference_columns():
+    # ADD COLUMN IF NOT EXISTS is PostgreSQL-only; check first so SQLite works too
+    existing = {column["name"] for column in inspect(engine).get_columns("saved_accents")}
+    with engine.begin() as conn:
+        for column in ("ref_audio_path", "ref_text"):
+            if column not in existing:
+                conn.execute(text(f"ALTER TABLE saved_accents ADD COLUMN {column} VARCHAR"))
+
+
+def backfill_accent_references():
+    db = SessionLocal()
+    try:
+        accents = db.query(SavedAccent).filter(SavedAccent.ref_audio_path.is_(None)).all()
+        print(f"🔄 Backfilling {len(accents)} saved accent(s)")
+        for accent in accents:
+            if not os.path.exists(accent.file_path):
+                print(f"⚠️ Missing accent file, skipping: {accent.file_path}")
+                continue
+            ref_audio_path, ref_text = prepare_reference_or_none(accent.file_path)
+            if ref_audio_path is None:
+                # Left NULL; rerun the backfill (or use the accent) to retry
+                continue
+            accent.ref_audio_path, accent.ref_text = ref_audio_path, ref_text
+            db.commit()
+            print(f"✅ {accent.accent_name}: {accent.ref_text[:50]}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    add_reference_columns()
+    backfill_accent_references()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -19,12 +19,18 @@ class User(Base):
 
 class SavedAccent(Base):
     __tablename__ = "saved_accents"
+    __table_args__ = (
+        # Per-user listing ordered/paginated by id
+        Index("ix_saved_accents_user_id_id", "user_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     accent_name = Column(String, nullable=False)  # User-provided name
     language_code = Column(String, nullable=False)  # e.g., "en", "hi", "fr"
     file_path = Column(String, nullable=False)  # Path to audio file
+    ref_audio_path = Column(String, nullable=True)  # Trimmed F5-TTS reference clip
+    ref_text = Column(String, nullable=True)  # Transcript of ref_audio_path ("" if not understood)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationship to user
@@ -1,33 +1,44 @@
 #uvicorn main:app --reload --port 8000 --host 127.0.0.1
-from fastapi import FastAPI, UploadFile, File, Form, Depends, HTTPException, Query
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, UploadFile, File, Form, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware import Middleware
-import os, shutil
+import os, json
 from pydantic import BaseModel
 from fastapi.staticfiles import StaticFiles
 from typing import Optional
-from pipeline.transcriber import transcribe
-from pipeline.translator import translate
-from pipeline.tts_generator import synthesize
+from pipeline.transcriber import transcribe, detect_language
+from pipeline.translator import translate, translation_cache
+from pipeline.tts_generator import synthesis_stage, synthesize, synthesize_accent_stream
+from pipeline.f5tts_synthesizer import F5TTS_AVAILABLE, get_engine_pool, prepare_reference_or_none, remove_reference
 from pipeline.utils import clip_audio
-from pipeline.lang_code import nllb_to_whisper_lang_code
-from pipeline.resemble_enhance_denoiser import denoise_audio
+from pipeline.audio_buffer import AudioBuffer
+from pipeline.lang_code import nllb_to_whisper_lang_code, whisper_to_nllb_lang_code
+from pipeline.resemble_enhance_denoiser import denoise_buffer, denoise_cache
 from pipeline.text_postprocessor import clean_transcription, clean_translation
+from pipeline.jobs import JobManager, report
+from pipeline.live import LiveInterpreter
+from pipeline.speech_pipeline import SpeechPipeline, UnsupportedLanguageError
+from pipeline.executors import StageBusyError, run_stage, stream_on_stage, wait_for_capacity
+from pipeline.metrics import register_cache, render_metrics
+from pipeline.romanizer import romanization_cache
+from pipeline.synthesis_cache import synthesis_cache
 import speech_recognition as sr
 import torch
 import torchaudio
 
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from login.auth import authenticate_user, create_access_token, get_user, pwd_context,  validate_and_get_user
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from login.auth import authenticate_user_async, create_access_token, get_user_async, hash_password_async, identity_cache, validate_and_get_user, UserIdentity
 from login.models import User, SavedAccent
-from login.database import get_db
+from login.database import get_async_db
+from login.accent_catalog import accent_catalog, etag_matches
 import tempfile
 import asyncio
 from starlette.requests import Request
 import re
-import subprocess
 
 app = FastAPI()
 
@@ -44,6 +55,16 @@ def email_to_username(email: str) -> str:
 # Track active synthesis processes per user to enable cancellation
 active_synthesis_tasks = {}
 
+# Background jobs for async_job=true requests (in-process store by default)
+job_manager = JobManager()
+
+# Hit ratios reported by /metrics
+register_cache("translation", translation_cache)
+register_cache("romanization", romanization_cache)
+register_cache("denoise", denoise_cache)
+register_cache("synthesis", synthesis_cache)
+register_cache("identity", identity_cache)
+
 PRODUCTION_ORIGINS = [
     "*",  # Allow all for dev
     "http://localhost:3000",
@@ -56,7 +77,8 @@ app = FastAPI(middleware=[
         CORSMiddleware,
         allow_origins=PRODUCTION_ORIGINS,
         allow_methods=["GET", "POST", "OPTIONS"],
-        allow_headers=["Authorization"],
+        allow_headers=["Authorization", "If-None-Match"],
+        expose_headers=["ETag", "Last-Modified", "X-Next-Cursor", "X-Model-Used", "X-Voice-Used", "Retry-After"],
         allow_credentials=False,
         max_age=300
     )
@@ -68,6 +90,26 @@ app = FastAPI(middleware=[
 # os.makedirs("accent_lib", exist_ok=True)
 # app.mount("/accent_lib", StaticFiles(directory="accent_lib"), name="accent_lib")
 
+
+@app.exception_handler(StageBusyError)
+async def stage_busy_handler(request: Request, exc: StageBusyError):
+    """Fail fast when a model stage is saturated instead of queueing without bound"""
+    return JSONResponse(
+        status_code=429,
+        content={"detail": f"Server busy ({exc.stage}), retry later", "retry_after": exc.retry_after},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+
+@app.on_event("startup")
+def preload_models():
+    """Load F5-TTS once at startup so voice cloning only pays for inference"""
+    if F5TTS_AVAILABLE and os.getenv("F5TTS_PRELOAD", "1") == "1":
+        try:
+            get_engine_pool().load()
+        except Exception as e:
+            print(f"⚠️ F5-TTS preload failed, models will load on first use: {e}")
+
 os.makedirs("static", exist_ok=True)
 os.makedirs("accent_lib", exist_ok=True)
 
@@ -79,9 +121,9 @@ app.mount("/accent_lib", StaticFiles(directory="accent_lib"), name="accent_lib")
 @app.post("/api/token")
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user_async(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(status_code=400, detail="Incorrect credentials")
     access_token = create_access_token(data={"sub": user.email})
@@ -95,21 +137,20 @@ class UserCreate(BaseModel):
 @app.post("/api/register")
 async def register(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    existing_user = get_user(db, user_data.email)
+    existing_user = await get_user_async(db, user_data.email)
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
-    hashed_password = pwd_context.hash(user_data.password)
+    hashed_password = await hash_password_async(user_data.password)
     db_user = User(email=user_data.email, hashed_password=hashed_password)
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
     return {"email": db_user.email}
 
 # Protected routes using direct app decorators
 @app.get("/api/protected")
-async def protected_route(user: User = Depends(validate_and_get_user)):
+async def protected_route(user: UserIdentity = Depends(validate_and_get_user)):
     """Example protected endpoint"""
     return {
         "message": "This is a protected route",
@@ -117,7 +158,7 @@ async def protected_route(user: User = Depends(validate_and_get_user)):
     }
 
 @app.get("/api/users/me")
-async def get_current_user(user: User = Depends(validate_and_get_user)):
+async def get_current_user(user: UserIdentity = Depends(validate_and_get_user)):
     """Get current user details"""
     return {
         "email": user.email,
@@ -126,19 +167,28 @@ async def get_current_user(user: User = Depends(validate_and_get_user)):
     }
 
 
-@app.post("/api/translate/")
-async def translateAndtranscribe_audio(
-    user_email: str = Form(...),
-    file: UploadFile = File(...),
-    source_lang: str = Form("auto"),
-    target_lang: str = Form("fra_Latn"),
-    enhance_audio_flag: bool = Form(False)
-):
+TRANSLATE_STAGES = ["denoise", "transcribe", "translate"]
+
+
+def run_translate_pipeline(
+    user_email: str,
+    audio_bytes: bytes,
+    source_lang: str,
+    target_lang: str,
+    enhance_audio_flag: bool,
+    progress=None
+) -> dict:
+    """
+    Denoise, transcribe and translate an uploaded recording.
+
+    Blocking; runs on a worker thread either directly for /api/translate/
+    or as a background job. `progress(stage, status)` is called as each of
+    TRANSLATE_STAGES starts and finishes.
+    """
     print("Processing audio")
     # Define paths using username
     username = email_to_username(user_email)
     user_dir = f"static/{username}"
-    UPLOAD_PATH = f"{user_dir}/original.wav"
     ENHANCED_PATH = f"{user_dir}/enhanced.wav"
     os.makedirs(user_dir, exist_ok=True)
     if os.path.exists(user_dir):
@@ -148,78 +198,244 @@ async def translateAndtranscribe_audio(
             except:
                 pass
 
-    # Save uploaded audio
-    with open(UPLOAD_PATH, "wb") as f:
-        shutil.copyfileobj(file.file, f)
+    # Decode the upload once; stages pass the buffer along in memory
+    upload = AudioBuffer.from_bytes(audio_bytes)
 
     # Denoise audio if enabled (using Resemble Enhance)
     print("🎵 Audio denoising enabled (Resemble Enhance)")
-    audio_for_processing = denoise_audio(UPLOAD_PATH, ENHANCED_PATH)
-    
-    # 🚨 FIX: Use Google Speech Recognition for Hindi
+    report(progress, "denoise", "running")
+    # Admission is checked once, here: a full denoise stage answers 429
+    # before any work is done. Later stages wait for a slot instead of
+    # rejecting a request whose denoising is already paid for.
+    denoised = run_stage("denoise", denoise_buffer, upload)
+    with wait_for_capacity():
+        # The denoised clip is the only audio file the client fetches
+        denoised.save(ENHANCED_PATH)
+        report(progress, "denoise", "completed")
+        report(progress, "transcribe", "running")
+
+        detected_language = None
+        speech_audio = denoised.for_whisper()
+        if source_lang == "auto":
+            # One short language-ID pass on the first seconds of speech picks the
+            # decoding language and the NLLB source code for translation
+            whisper_lang, _ = run_stage("transcribe", detect_language, speech_audio)
+            source_lang = whisper_to_nllb_lang_code(whisper_lang)
+            if source_lang is None:
+                report(progress, "transcribe", "failed")
+                raise HTTPException(
+                    status_code=422,
+                    detail=f"Detected language '{whisper_lang}' is not supported for translation"
+                )
+            detected_language = source_lang
+            report(progress, "transcribe", "running", detected_language=detected_language)
+
         # 🚨 FIX: Use Google Speech Recognition for Hindi
-    if source_lang == "hin_Deva":
-        print(f"🔊 USING GOOGLE SPEECH RECOGNITION FOR HINDI")
+        if source_lang == "hin_Deva":
+            print(f"🔊 USING GOOGLE SPEECH RECOGNITION FOR HINDI")
         
-        # Convert audio to proper WAV format for Google Speech Recognition
-        CONVERTED_PATH = f"{user_dir}/converted.wav"
-        try:
-            # First convert to proper WAV format that Google can read
-            subprocess.run([
-                'ffmpeg', '-i', UPLOAD_PATH, 
-                '-acodec', 'pcm_s16le', 
-                '-ar', '16000', 
-                '-ac', '1', 
-                '-f', 'wav',  # Force WAV format
-                CONVERTED_PATH, 
-                '-y'
-            ], check=True, capture_output=True)
-            
-            # Verify the file was created and has content
-            if os.path.exists(CONVERTED_PATH) and os.path.getsize(CONVERTED_PATH) > 0:
-                audio_for_processing = CONVERTED_PATH
-                print("✅ Audio converted for Google Speech Recognition")
-            else:
-                raise Exception("Converted file is empty or doesn't exist")
-                
-        except Exception as e:
-            print(f"❌ Audio conversion failed: {e}")
-            print("🔄 Using original audio with Whisper")
-            audio_for_processing = UPLOAD_PATH
-            text = transcribe(audio_for_processing, language="hi")
-        else:
+            # Google and the Whisper fallback share the original (undenoised) audio
+            hindi_audio = upload.for_whisper()
+
             # Use Google for Hindi transcription
             from pipeline.transcriber import transcribe_hindi
-            text = transcribe_hindi(audio_for_processing)
-            
+            text = run_stage("transcribe", transcribe_hindi, hindi_audio)
+
             # If Google fails, fall back to Whisper
             if not text:
                 print("🔄 Google failed, falling back to Whisper Hindi")
-                text = transcribe(audio_for_processing, language="hi")
+                text = run_stage("transcribe", transcribe, hindi_audio, language="hi")
             
-    elif source_lang != "auto":
-        source_lang_whisper = nllb_to_whisper_lang_code(source_lang.split('_')[0])
-        text = transcribe(audio_for_processing, language=source_lang_whisper)
-    else:
-        # Auto-detect language
-        text = transcribe(audio_for_processing)
-    # Clean transcription text
-    text = clean_transcription(text)
-    print(f"📝 Cleaned transcription: {text[:100]}...")
-
-    # Translate
-    translated = translate(text, source_lang, target_lang) if source_lang != target_lang else text
+        else:
+            source_lang_whisper = nllb_to_whisper_lang_code(source_lang.split('_')[0])
+            if detected_language:
+                source_lang_whisper = whisper_lang
+            text = run_stage("transcribe", transcribe, speech_audio, language=source_lang_whisper)
+        # Clean transcription text
+        text = clean_transcription(text)
+        print(f"📝 Cleaned transcription: {text[:100]}...")
+        report(progress, "transcribe", "completed")
+
+        # Translate
+        report(progress, "translate", "running")
+        translated = run_stage("translate", translate, text, source_lang, target_lang) if source_lang != target_lang else text
     
-    # Clean translation text
-    translated = clean_translation(translated)
-    print(f"📝 Cleaned translation: {translated[:100]}...")
+        # Clean translation text
+        translated = clean_translation(translated)
+        print(f"📝 Cleaned translation: {translated[:100]}...")
+        report(progress, "translate", "completed")
 
+        return {
+            "transcription": text,
+            "translation": translated,
+            "original_audio": ENHANCED_PATH,
+            "enhanced_audio": ENHANCED_PATH if enhance_audio_flag else None,
+            "enhancement_used": enhance_audio_flag,
+            "detected_language": detected_language
+        }
+
+
+@app.post("/api/translate/")
+async def translateAndtranscribe_audio(
+    user_email: str = Form(...),
+    file: UploadFile = File(...),
+    source_lang: str = Form("auto"),
+    target_lang: str = Form("fra_Latn"),
+    enhance_audio_flag: bool = Form(False),
+    async_job: bool = Form(False)  # Return a job id immediately and run in the background
+):
+    audio_bytes = await file.read()
+    args = (user_email, audio_bytes, source_lang, target_lang, enhance_audio_flag)
+
+    if async_job:
+        job_id = job_manager.submit("translate", TRANSLATE_STAGES, run_translate_pipeline, *args)
+        return job_accepted_response(job_id)
+
+    # Run the models off the event loop so other requests keep being served
+    return await run_in_threadpool(run_translate_pipeline, *args)
+
+
+def job_accepted_response(job_id: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=202,
+        content={"job_id": job_id, "status": "queued", "status_url": f"/api/jobs/{job_id}"}
+    )
+
+
+def streaming_audio_response(info: dict, chunks) -> StreamingResponse:
+    """Send synthesized audio to the client as each piece is produced"""
+    return StreamingResponse(
+        chunks,
+        media_type=info["media_type"],
+        headers={"X-Model-Used": info["model"], "X-Voice-Used": info["voice"]}
+    )
+
+
+# Target NLLB code -> TTS language code
+TTS_LANG_MAPPING = {
+    'eng_Latn': 'en', 'hin_Deva': 'hi', 'spa_Latn': 'es', 'fra_Latn': 'fr',
+    'deu_Latn': 'de', 'jpn_Jpan': 'ja', 'kor_Hang': 'ko', 'zho_Hans': 'zh',
+    'arb_Arab': 'ar', 'ita_Latn': 'it', 'por_Latn': 'pt', 'rus_Cyrl': 'ru',
+    'ben_Beng': 'bn', 'tam_Taml': 'ta', 'tel_Telu': 'te', 'kan_Knda': 'kn',
+    'mal_Mlym': 'ml', 'pan_Guru': 'pa', 'urd_Arab': 'ur', 'mar_Deva': 'mr',
+    'guj_Gujr': 'gu', 'nld_Latn': 'nl'
+}
+
+CLONE_STAGES = ["synthesize"]
+
+
+def run_clone_pipeline(
+    user_email: str,
+    translated_text: str,
+    target_lang: str,
+    accent: Optional[dict] = None,
+    progress=None
+) -> dict:
+    """
+    Synthesize translated text to static/<username>/generated_audio.wav.
+
+    Args:
+        accent: Saved accent fields (accent_name, file_path, ref_audio_path,
+            ref_text) for voice cloning, or None for the default voice
+    """
+    # Synthesize speech using username for paths
+    username = email_to_username(user_email)
+    user_dir = f"static/{username}"
+    os.makedirs(user_dir, exist_ok=True)
+
+    # Final output path
+    GENERATED_AUDIO_PATH = f"{user_dir}/generated_audio.wav"
+
+    whisper_lang = TTS_LANG_MAPPING.get(target_lang, 'en')
+    print(f"🌐 DIRECT LANGUAGE MAPPING: {target_lang} -> {whisper_lang}")
+
+    report(progress, "synthesize", "running")
+    if accent:
+        # Generate speech with F5-TTS (voice cloning)
+        print(f"🎤 Starting F5-TTS VOICE CLONING...")
+        status = run_stage(
+            synthesis_stage("f5tts"),
+            synthesize,
+            text=translated_text,
+            speaker_text="accent reference audio",
+            speaker_wav=accent["file_path"],
+            output_path=GENERATED_AUDIO_PATH,
+            lang=whisper_lang,
+            model="f5tts",
+            ref_audio_path=accent["ref_audio_path"],
+            ref_text=accent["ref_text"]
+        )
+    else:
+        # FORCE DEFAULT SYSTEM VOICE - NO VOICE CLONING
+        print(f"🔊 FORCING DEFAULT SYSTEM VOICE - No voice cloning")
+
+        # Generate speech with DEFAULT VOICE (no speaker_wav)
+        status = run_stage(
+            synthesis_stage("gtts"),
+            synthesize,
+            text=translated_text,
+            speaker_text="",
+            speaker_wav="",  # EMPTY = default voice
+            output_path=GENERATED_AUDIO_PATH,
+            lang=whisper_lang,
+            model="gtts"  # Force gTTS for default voice
+        )
+    report(progress, "synthesize", "completed" if status.get("success") else "failed")
+
+    print(f"✅ Synthesis complete for {user_email}")
     return {
-        "transcription": text,
-        "translation": translated,
-        "original_audio": ENHANCED_PATH,
-        "enhanced_audio": audio_for_processing if enhance_audio_flag else None,
-        "enhancement_used": enhance_audio_flag
+        "translated_audio": f"api/static/{username}/generated_audio.wav",
+        "synthesis_status": status,
+        "model_used": status.get("model", "unknown"),
+        "voice_used": "saved_accent" if accent else "default_system_voice"
+    }
+
+
+async def find_user_accent(db: AsyncSession, user_email: str, accent_id: int, not_found: str = "Saved accent not found"):
+    """
+    Load a user's saved accent with one query.
+
+    The accent is outer-joined to the user row, so a missing user and a
+    missing (or someone else's) accent are still told apart.
+    """
+    row = (await db.execute(
+        select(User.id, SavedAccent)
+        .outerjoin(SavedAccent, and_(SavedAccent.user_id == User.id, SavedAccent.id == accent_id))
+        .where(User.email == user_email)
+    )).first()
+
+    if row is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    if row.SavedAccent is None:
+        raise HTTPException(status_code=404, detail=not_found)
+    return row.SavedAccent
+
+
+async def load_saved_accent(db: AsyncSession, user_email: str, saved_accent_id: int) -> dict:
+    """
+    Look up a user's saved accent for voice cloning.
+
+    Returns:
+        dict: accent_name, file_path, ref_audio_path and ref_text
+    """
+    # Use saved accent from database
+    saved_accent = await find_user_accent(db, user_email, saved_accent_id)
+
+    print(f"🎭 Using SAVED ACCENT: {saved_accent.accent_name}")
+
+    # Accents without a stored reference (saved before references existed, or
+    # whose transcription failed transiently) get it computed here
+    if saved_accent.ref_audio_path is None:
+        ref_audio_path, ref_text = await run_in_threadpool(prepare_reference_or_none, saved_accent.file_path)
+        if ref_audio_path is not None:
+            saved_accent.ref_audio_path, saved_accent.ref_text = ref_audio_path, ref_text
+            await db.commit()
+
+    return {
+        "accent_name": saved_accent.accent_name,
+        "file_path": saved_accent.file_path,
+        "ref_audio_path": saved_accent.ref_audio_path,
+        "ref_text": saved_accent.ref_text
     }
 
 
@@ -232,7 +448,9 @@ async def clone_audio(
     target_lang: str = Form("fra_Latn"),
     use_saved_accent: bool = Form(False),  # Whether to use saved accent
     saved_accent_id: Optional[int] = Form(None),  # ID of saved accent to use
-    db: Session = Depends(get_db)
+    stream: bool = Form(False),  # Stream audio sentence by sentence instead of writing a file
+    async_job: bool = Form(False),  # Return a job id immediately and run in the background
+    db: AsyncSession = Depends(get_async_db)
 ):
     print(f"🎙️ TTS Request for {user_email}")
     print(f"   Translated: {translated_text}")
@@ -249,84 +467,32 @@ async def clone_audio(
             print(f"❌ Client disconnected for {user_email}, aborting synthesis")
             raise HTTPException(status_code=499, detail="Client disconnected")
 
-        # Synthesize speech using username for paths
-        username = email_to_username(user_email)
-        user_dir = f"static/{username}"
-        os.makedirs(user_dir, exist_ok=True)
-
-        # Final output path
-        GENERATED_AUDIO_PATH = f"{user_dir}/generated_audio.wav"
-
-        # Convert language code
-        # DIRECT LANGUAGE MAPPING - Add this
-        lang_mapping = {
-            'eng_Latn': 'en', 'hin_Deva': 'hi', 'spa_Latn': 'es', 'fra_Latn': 'fr',
-            'deu_Latn': 'de', 'jpn_Jpan': 'ja', 'kor_Hang': 'ko', 'zho_Hans': 'zh',
-            'arb_Arab': 'ar', 'ita_Latn': 'it', 'por_Latn': 'pt', 'rus_Cyrl': 'ru',
-            'ben_Beng': 'bn', 'tam_Taml': 'ta', 'tel_Telu': 'te', 'kan_Knda': 'kn',
-            'mal_Mlym': 'ml', 'pan_Guru': 'pa', 'urd_Arab': 'ur', 'mar_Deva': 'mr',
-            'guj_Gujr': 'gu', 'nld_Latn': 'nl'
-        }
-
-        whisper_lang = lang_mapping.get(target_lang, 'en')
-        print(f"🌐 DIRECT LANGUAGE MAPPING: {target_lang} -> {whisper_lang}")
-
         # FORCE DEFAULT VOICE WHEN NO ACCENT SELECTED
+        accent = None
         if use_saved_accent and saved_accent_id:
-            # Use saved accent from database
-            user = get_user(db, user_email)
-            if not user:
-                raise HTTPException(status_code=404, detail="User not found")
-
-            accent = db.query(SavedAccent).filter(
-                SavedAccent.id == saved_accent_id,
-                SavedAccent.user_id == user.id
-            ).first()
-
-            if not accent:
-                raise HTTPException(status_code=404, detail="Saved accent not found")
-
-            speaker_wav = accent.file_path
-            speaker_text = "accent reference audio"
-            print(f"🎭 Using SAVED ACCENT: {accent.accent_name}")
-            
-            # Generate speech with F5-TTS (voice cloning)
-            print(f"🎤 Starting F5-TTS VOICE CLONING...")
-            status = synthesize(
-                text=translated_text,
-                speaker_text=speaker_text,
-                speaker_wav=speaker_wav,
-                output_path=GENERATED_AUDIO_PATH,
-                lang=whisper_lang,
-                model="f5tts"
-            )
-            
-        else:
-            # FORCE DEFAULT SYSTEM VOICE - NO VOICE CLONING
-            print(f"🔊 FORCING DEFAULT SYSTEM VOICE - No voice cloning")
-            
-            # Generate speech with DEFAULT VOICE (no speaker_wav)
-            status = synthesize(
-                text=translated_text,
-                speaker_text="",
-                speaker_wav="",  # EMPTY = default voice
-                output_path=GENERATED_AUDIO_PATH,
-                lang=whisper_lang,
-                model="gtts"  # Force gTTS for default voice
+            accent = await load_saved_accent(db, user_email, saved_accent_id)
+
+        if stream:
+            info, chunks = await run_in_threadpool(
+                synthesize_accent_stream, translated_text, TTS_LANG_MAPPING.get(target_lang, 'en'), accent
             )
+            # Admission happens here: a full synthesis stage answers 429 before streaming starts
+            chunks = await run_in_threadpool(stream_on_stage, synthesis_stage(info["model"]), chunks)
+            return streaming_audio_response(info, chunks)
+
+        args = (user_email, translated_text, target_lang, accent)
+        if async_job:
+            job_id = job_manager.submit("cloneaudio", CLONE_STAGES, run_clone_pipeline, *args)
+            return job_accepted_response(job_id)
+
+        result = await run_in_threadpool(run_clone_pipeline, *args)
 
         # Check if client disconnected after TTS
         if await request.is_disconnected():
             print(f"❌ Client disconnected for {user_email}, aborting")
             raise HTTPException(status_code=499, detail="Client disconnected")
 
-        print(f"✅ Synthesis complete for {user_email}")
-        return {
-            "translated_audio": f"api/static/{username}/generated_audio.wav",
-            "synthesis_status": status,
-            "model_used": status.get("model", "unknown"),
-            "voice_used": "saved_accent" if use_saved_accent else "default_system_voice"
-        }
+        return result
     finally:
         # Always clean up the active task marker
         if user_email in active_synthesis_tasks:
@@ -334,6 +500,169 @@ async def clone_audio(
             print(f"🧹 Cleaned up synthesis task for {user_email}")
 
 
+@app.post("/api/speech_to_speech/")
+async def speech_to_speech(
+    user_email: str = Form(...),
+    file: UploadFile = File(...),
+    source_lang: str = Form("auto"),
+    target_lang: str = Form("fra_Latn"),
+    saved_accent_id: Optional[int] = Form(None),  # Answer in a saved (cloned) voice
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Denoise, transcribe, translate and synthesize in one request.
+
+    Sentences flow through the stages as soon as Whisper finishes them, and
+    the response is a newline-delimited JSON stream of per-sentence
+    transcript, translation and audio events (see pipeline.speech_pipeline).
+    """
+    audio_bytes = await file.read()
+    accent = None
+    if saved_accent_id:
+        accent = await load_saved_accent(db, user_email, saved_accent_id)
+
+    user_dir = f"static/{email_to_username(user_email)}"
+    os.makedirs(user_dir, exist_ok=True)
+    pipeline = SpeechPipeline(
+        audio_bytes,
+        source_lang,
+        target_lang,
+        TTS_LANG_MAPPING.get(target_lang, 'en'),
+        accent=accent,
+        enhanced_path=f"{user_dir}/enhanced.wav"
+    )
+    try:
+        # Admission happens here: a full stage answers 429 before streaming starts
+        await run_in_threadpool(pipeline.start)
+    except UnsupportedLanguageError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return StreamingResponse(pipeline.ndjson(), media_type="application/x-ndjson")
+
+
+@app.websocket("/ws/interpret")
+async def live_interpret(websocket: WebSocket, db: AsyncSession = Depends(get_async_db)):
+    """
+    Live interpretation: microphone PCM in, partial/final transcripts and
+    translated speech out. The message protocol is described in pipeline.live.
+
+    The first message is a JSON config: user_email, source_lang (NLLB code or
+    "auto"), target_lang, sample_rate (default 16000) and optionally
+    saved_accent_id to answer in a cloned voice.
+    """
+    await websocket.accept()
+    try:
+        config = await websocket.receive_json()
+        target_lang = config.get("target_lang", "fra_Latn")
+        accent = None
+        if config.get("saved_accent_id"):
+            accent = await load_saved_accent(db, config.get("user_email", ""), config["saved_accent_id"])
+        # Release the pooled connection for the rest of the session
+        await db.close()
+    except HTTPException as e:
+        await websocket.close(code=1008, reason=e.detail)
+        return
+
+    interpreter = LiveInterpreter(
+        config.get("source_lang", "auto"),
+        target_lang,
+        TTS_LANG_MAPPING.get(target_lang, 'en'),
+        sample_rate=int(config.get("sample_rate", 16000)),
+        accent=accent
+    )
+    finals = asyncio.Queue()
+
+    async def speak_finals():
+        # Sentences are translated and voiced in order while transcription continues
+        while (event := await finals.get()) is not None:
+            sentence = event["sentence"]
+            translation = await run_in_threadpool(interpreter.translate, event["text"])
+            await websocket.send_json({"type": "translation", "sentence": sentence, "text": translation})
+            if not translation:
+                continue
+            info, chunks = await run_in_threadpool(interpreter.speak, translation)
+            await websocket.send_json({
+                "type": "audio_start", "sentence": sentence,
+                "media_type": info["media_type"], "model": info["model"]
+            })
+            while (chunk := await run_in_threadpool(next, chunks, None)) is not None:
+                await websocket.send_bytes(chunk)
+            await websocket.send_json({"type": "audio_end", "sentence": sentence})
+
+    async def send_events(events):
+        for event in events:
+            await websocket.send_json(event)
+            if event["type"] == "final":
+                finals.put_nowait(event)
+
+    async def close_session():
+        """Close normally, or report why translating/voicing failed"""
+        error = speaker.exception()
+        if error is None:
+            await websocket.close()
+            return
+        print(f"❌ Live interpretation failed: {error}")
+        await websocket.send_json({"type": "error", "detail": str(error)})
+        await websocket.close(code=1011)
+
+    speaker = asyncio.create_task(speak_finals())
+    receiver = None
+    try:
+        while True:
+            receiver = asyncio.create_task(websocket.receive())
+            # Wait on the speaker too, so its failure ends the session right away
+            await asyncio.wait({receiver, speaker}, return_when=asyncio.FIRST_COMPLETED)
+            if not receiver.done():
+                await close_session()
+                break
+            message = receiver.result()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes"):
+                await send_events(await run_in_threadpool(interpreter.feed, message["bytes"]))
+            elif message.get("text") and json.loads(message["text"]).get("type") == "stop":
+                await send_events(await run_in_threadpool(interpreter.flush))
+                finals.put_nowait(None)
+                await asyncio.wait({speaker})
+                await close_session()
+                break
+    except WebSocketDisconnect:
+        print("🔌 Live interpretation client disconnected")
+    finally:
+        speaker.cancel()
+        if receiver is not None:
+            receiver.cancel()
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Status, per-stage progress and result of a background job"""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+def store_accent_clip(audio_bytes: bytes, file_path: str):
+    """Clip an uploaded accent recording and save it to file_path"""
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=True) as tmp:
+        tmp.write(audio_bytes)
+        tmp.flush()
+        clip_audio(tmp.name, file_path)
+
+
+def store_saved_accent(audio_bytes: bytes, file_path: str):
+    """
+    Save a named accent clip and prepare its F5-TTS reference (trimmed clip
+    + transcript) once, so synthesis can reuse it from the database.
+
+    Returns:
+        tuple: (ref_audio_path, ref_text), or (None, None) if speech
+        recognition was unreachable and the reference should be retried
+    """
+    store_accent_clip(audio_bytes, file_path)
+    return prepare_reference_or_none(file_path)
+
+
 @app.post("/api/accent_upload/")
 async def process_audio(
     user_email: str= Form(...),
@@ -345,9 +674,9 @@ async def process_audio(
     lang = nllb_to_whisper_lang_code(lang.split('_')[0])
     lib_path = f"accent_lib/{username}"
     os.makedirs(lib_path, exist_ok=True)
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=True) as tmp:
-        tmp.write(file.file.read()); tmp.flush()
-        clip_audio(tmp.name, f"{lib_path}/_{lang}.wav")
+    # Library clips have no stored reference; synthesis prepares one on use
+    await run_in_threadpool(store_accent_clip, await file.read(), f"{lib_path}/_{lang}.wav")
+    accent_catalog.bump(username)
 
     return {
         "status": 'Accent audio saved successfully',
@@ -357,22 +686,29 @@ async def process_audio(
 
 
 @app.get("/api/accent_languages")
-async def list_user_languages(user_email: str = Query(...)):
+async def list_user_languages(request: Request, response: Response, user_email: str = Query(...)):
     username = email_to_username(user_email)
-    user_dir = f"accent_lib/{username}"
+    etag, headers = accent_catalog.validators(username)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
 
-    if not os.path.isdir(user_dir):
-        return []
+    def load_languages():
+        user_dir = f"accent_lib/{username}"
 
-    audio_files = [
-        {
-            "lang": f.split("_")[-1].split(".")[0],
-            "url": f"accent_lib/{username}/{f}"
-        }
-        for f in os.listdir(user_dir)
-        if f.endswith(".wav")
-    ]
-    return audio_files
+        if not os.path.isdir(user_dir):
+            return []
+
+        return [
+            {
+                "lang": f.split("_")[-1].split(".")[0],
+                "url": f"accent_lib/{username}/{f}"
+            }
+            for f in os.listdir(user_dir)
+            if f.endswith(".wav") and not f.endswith("_trimmed.wav")
+        ]
+
+    return accent_catalog.languages(username, load_languages)
 
 @app.post("/api/save_accent/")
 async def save_accent(
@@ -380,13 +716,13 @@ async def save_accent(
     accent_name: str = Form(...),
     file: UploadFile = File(...),
     lang: str = Form(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     print("Received Accent:", user_email, accent_name, lang, file.filename, file.content_type)
     """Save accent audio with user-provided name"""
-    # Get user from database
-    user = get_user(db, user_email)
-    if not user:
+    # Get user from database (only its id is needed)
+    user_id = (await db.execute(select(User.id).where(User.email == user_email))).scalar_one_or_none()
+    if user_id is None:
         raise HTTPException(status_code=404, detail="User not found")
 
     # Create user accent directory using username
@@ -402,24 +738,25 @@ async def save_accent(
     file_path = f"{accent_dir}/{filename}"
 
     # Save audio file
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=True) as tmp:
-        tmp.write(file.file.read())
-        tmp.flush()
-        clip_audio(tmp.name, file_path)
+    ref_audio_path, ref_text = await run_in_threadpool(store_saved_accent, await file.read(), file_path)
 
     whisper_lang = nllb_to_whisper_lang_code(lang.split('_')[0])
     print(f"🌐 Language conversion: {lang} -> {whisper_lang}")
 
     # Save to database
     saved_accent = SavedAccent(
-        user_id=user.id,
+        user_id=user_id,
         accent_name=accent_name,
         language_code=whisper_lang,
-        file_path=file_path
+        file_path=file_path,
+        ref_audio_path=ref_audio_path,
+        ref_text=ref_text
     )
     db.add(saved_accent)
-    db.commit()
-    db.refresh(saved_accent)
+    # The flush assigns the id; no refresh query is needed after commit
+    await db.flush()
+    await db.commit()
+    accent_catalog.bump(username)
 
     return {
         "status": "success",
@@ -430,15 +767,37 @@ async def save_accent(
 
 @app.get("/api/saved_accents/")
 async def get_saved_accents(
+    request: Request,
+    response: Response,
     user_email: str = Query(...),
-    db: Session = Depends(get_db)
+    cursor: Optional[int] = Query(None),  # Return accents with id greater than this
+    limit: Optional[int] = Query(None, ge=1, le=200),  # Page size (default: all)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get list of saved accents for a user"""
-    user = get_user(db, user_email)
-    if not user:
-        return []
-
-    accents = db.query(SavedAccent).filter(SavedAccent.user_id == user.id).all()
+    """
+    Get list of saved accents for a user, oldest first.
+
+    With `limit`, the response is one page and the X-Next-Cursor header
+    carries the cursor for the next one (absent on the last page).
+    """
+    etag, headers = accent_catalog.validators(email_to_username(user_email), cursor, limit)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+    # Joined on the user, so an unknown user simply has no accents
+    query = select(SavedAccent).join(User, SavedAccent.user_id == User.id).where(User.email == user_email)
+    if cursor is not None:
+        query = query.where(SavedAccent.id > cursor)
+    query = query.order_by(SavedAccent.id)
+    if limit is not None:
+        # One extra row tells whether another page follows
+        query = query.limit(limit + 1)
+    accents = (await db.execute(query)).scalars().all()
+
+    if limit is not None and len(accents) > limit:
+        accents = accents[:limit]
+        response.headers["X-Next-Cursor"] = str(accents[-1].id)
 
     return [
         {
@@ -455,28 +814,20 @@ async def get_saved_accents(
 async def delete_saved_accent(
     accent_id: int,
     user_email: str = Query(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a saved accent"""
-    user = get_user(db, user_email)
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    accent = db.query(SavedAccent).filter(
-        SavedAccent.id == accent_id,
-        SavedAccent.user_id == user.id
-    ).first()
-
-    if not accent:
-        raise HTTPException(status_code=404, detail="Accent not found")
+    accent = await find_user_accent(db, user_email, accent_id, not_found="Accent not found")
 
     # Delete file
     if os.path.exists(accent.file_path):
         os.remove(accent.file_path)
+    remove_reference(accent.file_path)
 
     # Delete from database
-    db.delete(accent)
-    db.commit()
+    await db.delete(accent)
+    await db.commit()
+    accent_catalog.bump(email_to_username(user_email))
 
     return {"status": "success", "message": "Accent deleted"}
 
@@ -489,3 +840,10 @@ def get_output_audio(user_email: str = Query(...)):
 @app.get("/api/ping")
 def ping():
     return {"status":"OK"}
+
+
+@app.get("/metrics")
+def metrics():
+    """Prometheus scrape endpoint: stage latencies, queue depths, model load times, cache hit ratios"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
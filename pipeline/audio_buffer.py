@@ -0,0 +1,96 @@
+"""
+In-memory audio passed between pipeline stages.
+
+An upload is decoded once into an AudioBuffer; denoising, transcription and
+language detection all work on buffers instead of re-reading WAV files, and
+only artifacts the client downloads are written to disk. Decoding, mixing
+down and resampling go through pipeline.audio_io, like every other entry
+point, so a clip is processed the same way wherever it comes in.
+"""
+
+import hashlib
+import io
+
+import numpy as np
+import soundfile as sf
+import torch
+
+from pipeline.audio_io import WHISPER_SAMPLE_RATE, read_audio, resample, to_mono
+from pipeline.metrics import timed
+
+
+class AudioBuffer:
+    """
+    Decoded audio: float32 samples shaped (frames,) for mono or
+    (frames, channels), plus the sample rate.
+
+    Buffers are treated as immutable; every transform returns a new one.
+    """
+
+    def __init__(self, samples: np.ndarray, rate: int):
+        self.samples = np.ascontiguousarray(samples, dtype=np.float32)
+        self.rate = int(rate)
+        self._content_hash = None
+
+    @property
+    def channels(self) -> int:
+        return 1 if self.samples.ndim == 1 else self.samples.shape[1]
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / self.rate
+
+    @property
+    def content_hash(self) -> str:
+        """sha256 of the samples and rate, computed on first use"""
+        if self._content_hash is None:
+            digest = hashlib.sha256(f"{self.rate}:{self.samples.shape}".encode())
+            digest.update(self.samples.tobytes())
+            self._content_hash = digest.hexdigest()
+        return self._content_hash
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "AudioBuffer":
+        """Decode an uploaded file at its native rate and channel count"""
+        return cls(*read_audio(data))
+
+    @classmethod
+    def from_file(cls, path: str) -> "AudioBuffer":
+        with timed("file_io", backend="read"), open(path, "rb") as f:
+            data = f.read()
+        return cls.from_bytes(data)
+
+    @classmethod
+    def from_tensor(cls, wav: torch.Tensor, rate: int) -> "AudioBuffer":
+        """From a torch waveform shaped (frames,) or (channels, frames)"""
+        wav = wav.detach().cpu()
+        samples = wav.numpy() if wav.dim() == 1 else wav.numpy().T
+        return cls(samples.squeeze(1) if samples.ndim == 2 and samples.shape[1] == 1 else samples, rate)
+
+    def mono(self) -> "AudioBuffer":
+        if self.channels == 1:
+            return self
+        return AudioBuffer(to_mono(self.samples), self.rate)
+
+    def resample(self, rate: int) -> "AudioBuffer":
+        if rate == self.rate:
+            return self
+        return AudioBuffer(resample(self.samples, self.rate, rate), rate)
+
+    def to_tensor(self) -> torch.Tensor:
+        """Mono samples as a 1-D torch tensor"""
+        return torch.from_numpy(self.mono().samples)
+
+    def for_whisper(self) -> np.ndarray:
+        """16 kHz mono float32 array, as expected by the transcribers"""
+        return self.mono().resample(WHISPER_SAMPLE_RATE).samples
+
+    def to_wav_bytes(self, subtype: str = "PCM_16") -> bytes:
+        buffer = io.BytesIO()
+        sf.write(buffer, self.samples, self.rate, format="WAV", subtype=subtype)
+        return buffer.getvalue()
+
+    def save(self, path: str) -> str:
+        with timed("file_io", backend="write"):
+            sf.write(path, self.samples, self.rate, subtype="PCM_16")
+        return path
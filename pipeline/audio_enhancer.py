@@ -2,8 +2,18 @@ import numpy as np
 import soundfile as sf
 import librosa
 import noisereduce as nr
+import soxr
 from scipy import signal
 import os
+import tempfile
+
+# Frames read from the input per block in enhance_audio_streaming
+ENHANCE_BLOCK_SIZE = 65536
+# noisereduce's own defaults; reproducing its chunking keeps the streaming
+# output identical to reduce_noise() on the whole signal
+NOISE_CHUNK_SIZE = 600000
+NOISE_PADDING = 30000
+PRE_EMPHASIS = 0.97
 
 
 def enhance_audio(input_path: str, output_path: str, target_sr: int = 16000) -> str:
@@ -94,6 +104,158 @@ def enhance_audio(input_path: str, output_path: str, target_sr: int = 16000) ->
         return input_path
 
 
+def _reduce_noise(padded: np.ndarray, sr: int) -> np.ndarray:
+    # One padded chunk, filtered exactly as noisereduce filters each of its chunks
+    return nr.reduce_noise(
+        y=padded,
+        sr=sr,
+        stationary=False,
+        prop_decrease=0.8,
+        chunk_size=len(padded),
+        padding=0
+    )
+
+
+def _resampled_blocks(input_path: str, target_sr: int):
+    """Yield the input as mono float32 blocks at target_sr"""
+    sr = sf.info(input_path).samplerate
+    resampler = None
+    if sr != target_sr:
+        resampler = soxr.ResampleStream(sr, target_sr, 1, dtype="float32", quality="HQ")
+        print(f"  Resampling: {sr} Hz -> {target_sr} Hz")
+
+    blocks = sf.blocks(input_path, blocksize=ENHANCE_BLOCK_SIZE, dtype="float32", always_2d=True)
+    block = next(blocks, None)
+    while block is not None:
+        following = next(blocks, None)
+        # Average channels to mono
+        mono = block.mean(axis=1) if block.shape[1] > 1 else block[:, 0]
+        if resampler is not None:
+            mono = resampler.resample_chunk(mono, last=following is None)
+        yield mono
+        block = following
+
+
+def _noise_reduced_blocks(blocks, sr: int):
+    """
+    Spectral gating over a stream of blocks.
+
+    noisereduce splits signals longer than NOISE_CHUNK_SIZE into chunks and
+    filters each with NOISE_PADDING samples of context (zeros outside the
+    signal) on both sides; shorter signals are filtered in one piece with
+    the same zero padding. This keeps just enough audio buffered to build
+    the same padded chunks.
+    """
+    span = NOISE_PADDING + NOISE_CHUNK_SIZE + NOISE_PADDING
+    # buffer[0] is NOISE_PADDING samples before the current chunk start
+    buffer = np.zeros(NOISE_PADDING, dtype=np.float32)
+    exhausted = False
+    chunked = False
+
+    while True:
+        pending = [buffer]
+        buffered = len(buffer)
+        while buffered < span and not exhausted:
+            block = next(blocks, None)
+            if block is None:
+                exhausted = True
+            else:
+                pending.append(block)
+                buffered += len(block)
+        buffer = np.concatenate(pending)
+
+        available = len(buffer) - NOISE_PADDING
+        if available <= 0:
+            return
+
+        if not chunked and exhausted and available <= NOISE_CHUNK_SIZE:
+            # Whole signal fits in one chunk
+            padded = np.concatenate((buffer, np.zeros(NOISE_PADDING, dtype=np.float32)))
+            yield _reduce_noise(padded, sr)[NOISE_PADDING:NOISE_PADDING + available]
+            return
+
+        chunked = True
+        padded = buffer[:span]
+        if len(padded) < span:
+            padded = np.concatenate((padded, np.zeros(span - len(padded), dtype=np.float32)))
+        yield _reduce_noise(padded, sr)[NOISE_PADDING:NOISE_PADDING + min(NOISE_CHUNK_SIZE, available)]
+
+        if available <= NOISE_CHUNK_SIZE:
+            return
+        # The next chunk starts NOISE_CHUNK_SIZE later and keeps its left context
+        buffer = buffer[NOISE_CHUNK_SIZE:]
+
+
+def enhance_audio_streaming(input_path: str, output_path: str, target_sr: int = 16000) -> str:
+    """
+    Constant-memory version of enhance_audio() for long recordings.
+
+    Processes the file in blocks with the same steps and the same output:
+    filter state (sosfilt zi), the previous sample for pre-emphasis and the
+    noise-reduction context are carried across block boundaries. The first
+    pass writes unnormalized samples to a scratch file while tracking the
+    peak; the second pass scales them and writes output_path. (The
+    intermediate normalization in enhance_audio() is a constant gain that
+    the final normalization cancels out, so it is skipped.)
+
+    Args:
+        input_path: Path to input audio file (formats readable by libsndfile)
+        output_path: Path to save enhanced audio
+        target_sr: Target sample rate (default 16000 Hz)
+
+    Returns:
+        Path to enhanced audio file
+    """
+    print(f"🎵 Enhancing audio (streaming): {input_path}")
+
+    try:
+        sr = target_sr
+        nyquist = sr / 2
+        low_freq = 80 / nyquist
+        high_freq = min(8000 / nyquist, 0.99)  # Ensure below Nyquist
+        sos = signal.butter(4, [low_freq, high_freq], btype='band', output='sos')
+        zi = np.zeros((sos.shape[0], 2))
+        previous = None
+        peak = 0.0
+
+        # Ensure output directory exists
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+        with tempfile.TemporaryFile() as scratch:
+            # Pass 1: noise reduction, bandpass and pre-emphasis, block by block
+            for reduced in _noise_reduced_blocks(_resampled_blocks(input_path, target_sr), sr):
+                filtered, zi = signal.sosfilt(sos, reduced, zi=zi)
+
+                emphasized = filtered.copy()
+                emphasized[1:] -= PRE_EMPHASIS * filtered[:-1]
+                if previous is not None:
+                    emphasized[0] -= PRE_EMPHASIS * previous
+                previous = filtered[-1]
+
+                peak = max(peak, float(np.abs(emphasized).max()))
+                scratch.write(emphasized.tobytes())
+            print("  ✓ Noise reduction, bandpass filter and pre-emphasis applied")
+
+            # Pass 2: peak normalization to 0.95
+            scale = 0.95 / peak if peak > 0 else 1.0
+            scratch.seek(0)
+            with sf.SoundFile(output_path, "w", samplerate=sr, channels=1) as out:
+                while True:
+                    block = np.frombuffer(scratch.read(ENHANCE_BLOCK_SIZE * 8), dtype=np.float64)
+                    if not len(block):
+                        break
+                    out.write(block * scale)
+
+        print(f"✅ Enhanced audio saved to: {output_path}")
+        return output_path
+
+    except Exception as e:
+        print(f"❌ Audio enhancement failed: {e}")
+        print(f"   Using original audio: {input_path}")
+        # If enhancement fails, return original path
+        return input_path
+
+
 def enhance_audio_simple(input_path: str, output_path: str, target_sr: int = 16000) -> str:
     """
     Simplified audio enhancement (fallback if noisereduce not available).
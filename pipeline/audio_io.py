@@ -0,0 +1,94 @@
+"""
+In-process audio decoding.
+
+Uploads are decoded straight into float32 NumPy arrays with libsndfile
+(WAV, FLAC, OGG, and MP3 with libsndfile >= 1.1). ffmpeg is only used as a
+fallback for containers libsndfile cannot read, and even then it streams
+raw samples through a pipe instead of writing an intermediate file.
+"""
+
+import io
+import subprocess
+
+import numpy as np
+import soundfile as sf
+import soxr
+
+from pipeline.metrics import timed
+
+WHISPER_SAMPLE_RATE = 16000
+# Rate used when ffmpeg has to decode a container libsndfile cannot read
+FALLBACK_SAMPLE_RATE = 44100
+
+
+def resample(audio: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
+    """Resample a float32 array shaped (frames,) or (frames, channels)"""
+    if orig_sr == target_sr:
+        return audio
+    return soxr.resample(audio, orig_sr, target_sr).astype(np.float32, copy=False)
+
+
+def _decode_with_ffmpeg(source, sample_rate: int) -> np.ndarray:
+    """Decode anything ffmpeg understands to mono float32 at sample_rate via a pipe"""
+    from_bytes = isinstance(source, (bytes, bytearray))
+    with timed("ffmpeg_convert", backend="pipe"):
+        result = subprocess.run([
+            "ffmpeg", "-nostdin", "-loglevel", "error",
+            "-i", "pipe:0" if from_bytes else source,
+            "-f", "f32le",
+            "-ac", "1",
+            "-ar", str(sample_rate),
+            "pipe:1"
+        ], input=source if from_bytes else None, capture_output=True, check=True)
+    return np.frombuffer(result.stdout, dtype=np.float32)
+
+
+def read_audio(source, fallback_rate: int = FALLBACK_SAMPLE_RATE) -> tuple:
+    """
+    Decode an audio file or in-memory upload at its native rate.
+
+    Args:
+        source: File path or raw file bytes
+        fallback_rate: Rate ffmpeg decodes to when libsndfile cannot read
+            the container (ffmpeg output is always mono)
+
+    Returns:
+        tuple: (float32 array shaped (frames,) or (frames, channels), sample rate)
+    """
+    try:
+        data = io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+        audio, sr = sf.read(data, dtype="float32")
+    except (sf.LibsndfileError, RuntimeError, TypeError) as e:
+        print(f"🔄 libsndfile could not decode audio ({e}), falling back to ffmpeg")
+        return _decode_with_ffmpeg(source, fallback_rate), fallback_rate
+    return audio, sr
+
+
+def to_mono(audio: np.ndarray) -> np.ndarray:
+    """Average the channels of a (frames, channels) array; mono arrays pass through"""
+    if audio.ndim == 1:
+        return audio
+    return np.ascontiguousarray(audio.mean(axis=1) if audio.shape[1] > 1 else audio[:, 0])
+
+
+def decode_audio(source, sample_rate: int = WHISPER_SAMPLE_RATE) -> np.ndarray:
+    """
+    Decode an audio file or in-memory upload to a mono float32 array.
+
+    Args:
+        source: File path or raw file bytes
+        sample_rate: Output sample rate (16 kHz is what Whisper expects)
+
+    Returns:
+        1-D float32 array in [-1, 1] at sample_rate
+    """
+    # ffmpeg can decode straight to the target rate
+    audio, sr = read_audio(source, fallback_rate=sample_rate)
+    return resample(to_mono(audio), sr, sample_rate)
+
+
+def to_wav_bytes(audio: np.ndarray, sample_rate: int = WHISPER_SAMPLE_RATE) -> bytes:
+    """Encode a mono float32 array as 16-bit PCM WAV in memory"""
+    buffer = io.BytesIO()
+    sf.write(buffer, audio, sample_rate, format="WAV", subtype="PCM_16")
+    return buffer.getvalue()
@@ -0,0 +1,131 @@
+"""
+Size-bounded, content-addressed file cache on local disk.
+
+Used for large binary results such as denoised audio. Each entry is one
+file named by its key; reads refresh the file's mtime, and when the total
+size exceeds the limit the least recently used files are deleted. Files are
+written atomically, so several worker processes can share one directory.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+
+
+def hash_key(*parts) -> str:
+    """sha256 over bytes and/or strings, e.g. input audio plus the settings used on it"""
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part if isinstance(part, (bytes, bytearray, memoryview)) else str(part).encode("utf-8")
+        # Length prefix keeps ("ab", "c") and ("a", "bc") distinct
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class DiskLRUCache:
+    """
+    Directory of cached files evicted least-recently-used first.
+
+    Args:
+        directory: Where entries are stored (created if missing); None or ""
+            disables the cache
+        max_bytes: Total size the directory is trimmed back to
+        suffix: File extension for entries (e.g. ".wav")
+    """
+
+    def __init__(self, directory, max_bytes: int, suffix: str = ""):
+        self.directory = directory or None
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self._size = 0
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            self._size = sum(size for _, _, size in self._entries())
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.suffix)
+
+    def get_path(self, key: str):
+        """Path of the cached file for key, or None on a miss"""
+        if not self.enabled:
+            return None
+        path = self.path_for(key)
+        try:
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def get(self, key: str):
+        """Cached bytes for key, or None on a miss"""
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:  # evicted by another process in between
+            return None
+
+    def put(self, key: str, data: bytes) -> None:
+        if not self.enabled:
+            return
+        with tempfile.NamedTemporaryFile(dir=self.directory, suffix=".tmp", delete=False) as tmp:
+            tmp.write(data)
+        self._commit(tmp.name, key, len(data))
+
+    def _commit(self, tmp_path: str, key: str, size: int):
+        path = self.path_for(key)
+        with self._lock:
+            # Overwriting a key replaces its old file; only the difference is added
+            try:
+                replaced = os.path.getsize(path)
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(tmp_path, path)
+            self._size += size - replaced
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(self.suffix) and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.path, stat.st_size))
+        return entries
+
+    def _evict(self):
+        # Rescan: other processes sharing the directory also add and remove files
+        entries = sorted(self._entries())
+        total = sum(size for _, _, size in entries)
+        for _, path, size in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._size = total
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "bytes": self._size,
+        }
@@ -0,0 +1,174 @@
+"""
+Bounded executors for the model stages of the pipeline.
+
+Each stage (denoise, transcribe, translate, synthesize, gtts) runs on its
+own thread pool with a fixed concurrency and a bounded queue. When the queue is
+full a request is rejected immediately with StageBusyError, which the API
+turns into a 429 with a Retry-After estimated from observed stage latency,
+instead of oversubscribing the CPUs and slowing every request down.
+
+Concurrency and queue depth are configured per stage with
+STAGE_<NAME>_CONCURRENCY and STAGE_<NAME>_QUEUE environment variables.
+"""
+
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# stage: (default concurrency, default queue depth)
+STAGE_DEFAULTS = {
+    "denoise": (1, 4),
+    "transcribe": (1, 8),
+    "translate": (8, 32),  # callers wait on the NLLB micro-batcher, which runs one model pass at a time
+    "synthesize": (1, 8),  # F5-TTS inference
+    "gtts": (8, 32),  # default-voice requests are network I/O, kept off the F5-TTS worker
+}
+
+# Retry-After used before a stage has completed any work
+DEFAULT_RETRY_AFTER = 5
+
+
+class StageBusyError(Exception):
+    """Raised when a stage queue is full; carries a Retry-After estimate in seconds"""
+
+    def __init__(self, stage: str, retry_after: int):
+        super().__init__(f"{stage} is at capacity")
+        self.stage = stage
+        self.retry_after = retry_after
+
+
+_admission = threading.local()
+
+
+@contextmanager
+def wait_for_capacity():
+    """
+    Make stage submissions from this thread wait for a free slot instead of
+    being rejected. Used by background jobs, which were already admitted.
+    """
+    previous = getattr(_admission, "wait", False)
+    _admission.wait = True
+    try:
+        yield
+    finally:
+        _admission.wait = previous
+
+
+class StageExecutor:
+    """Thread pool with bounded concurrency + queue depth and latency tracking"""
+
+    def __init__(self, name: str, concurrency: int, queue_depth: int):
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.queue_depth = max(0, queue_depth)
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix=f"stage-{name}")
+        self._slots = threading.BoundedSemaphore(self.concurrency + self.queue_depth)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._latency = None  # exponentially weighted moving average, seconds
+
+    @property
+    def in_flight(self) -> int:
+        return self._running
+
+    @property
+    def queued(self) -> int:
+        return self._pending - self._running
+
+    def retry_after(self) -> int:
+        """Seconds until a newly queued request would likely start"""
+        if self._latency is None:
+            return DEFAULT_RETRY_AFTER
+        waves = math.ceil((self._pending + 1) / self.concurrency)
+        return max(1, math.ceil(self._latency * waves))
+
+    def submit(self, fn, *args, **kwargs):
+        """Queue fn on this stage, or raise StageBusyError if the queue is full"""
+        return self._submit(fn, args, kwargs, wait=getattr(_admission, "wait", False))
+
+    def submit_waiting(self, fn, *args, **kwargs):
+        """Queue fn on this stage, waiting for a free slot if the queue is full"""
+        return self._submit(fn, args, kwargs, wait=True)
+
+    def _submit(self, fn, args, kwargs, wait):
+        if wait:
+            self._slots.acquire()
+        elif not self._slots.acquire(blocking=False):
+            raise StageBusyError(self.name, self.retry_after())
+
+        with self._lock:
+            self._pending += 1
+        try:
+            return self._executor.submit(self._timed, fn, args, kwargs)
+        except Exception:
+            self._done()
+            raise
+
+    def run(self, fn, *args, **kwargs):
+        """Run fn on this stage and wait for its result"""
+        return self.submit(fn, *args, **kwargs).result()
+
+    def _timed(self, fn, args, kwargs):
+        with self._lock:
+            self._running += 1
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._running -= 1
+                self._latency = elapsed if self._latency is None else 0.8 * self._latency + 0.2 * elapsed
+            self._done()
+
+    def _done(self):
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+
+def _stage_setting(name: str, setting: str, default: int) -> int:
+    return int(os.getenv(f"STAGE_{name.upper()}_{setting}", str(default)))
+
+
+STAGES = {
+    name: StageExecutor(
+        name,
+        _stage_setting(name, "CONCURRENCY", concurrency),
+        _stage_setting(name, "QUEUE", queue_depth),
+    )
+    for name, (concurrency, queue_depth) in STAGE_DEFAULTS.items()
+}
+
+
+def run_stage(stage: str, fn, *args, **kwargs):
+    """Run fn on the bounded executor of `stage` and return its result"""
+    return STAGES[stage].run(fn, *args, **kwargs)
+
+
+_END = object()
+
+
+def stream_on_stage(stage: str, iterator):
+    """
+    Produce the items of a lazy iterator (e.g. streamed synthesis) on a
+    stage executor.
+
+    The first item is produced before returning, so a full stage raises
+    StageBusyError while an error response can still be sent. Once a stream
+    has started, later items wait for capacity rather than cutting it off.
+    """
+    executor = STAGES[stage]
+    first = executor.run(next, iterator, _END)
+
+    def items():
+        item = first
+        while item is not _END:
+            yield item
+            item = executor.submit_waiting(next, iterator, _END).result()
+
+    return items()
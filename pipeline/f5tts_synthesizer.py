@@ -3,11 +3,20 @@ import torch
 
 import torchaudio
 import os
-import re
+import queue
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
 from pydub import AudioSegment
 import numpy as np
 import speech_recognition as sr
 from pydub.silence import detect_nonsilent
+from pipeline.metrics import record_model_load, timed
+from pipeline.text_postprocessor import split_sentences
+from pipeline.synthesis_cache import (
+    cached_sentences, decode_wave, encode_wave, sentence_key, synthesis_cache, voice_id
+)
 
 # Import F5-TTS modules
 try:
@@ -17,6 +26,70 @@ except ImportError:
     F5TTS_AVAILABLE = False
     print("Warning: F5-TTS not installed. Please install with: pip install f5-tts")
 
+# Sentences per batched F5-TTS forward pass, and the pause inserted between sentences
+F5TTS_BATCH_SIZE = int(os.getenv("F5TTS_BATCH_SIZE", "4"))
+SENTENCE_PAUSE_MS = int(os.getenv("F5TTS_SENTENCE_PAUSE_MS", "150"))
+# F5-TTS inference defaults (same values f5_tts.api.F5TTS.infer uses)
+F5TTS_NFE_STEP = 32
+F5TTS_CFG_STRENGTH = 2.0
+F5TTS_SWAY_SAMPLING_COEF = -1.0
+
+
+class ReferenceTranscriptionError(Exception):
+    """Speech recognition could not be reached for a reference clip; worth retrying later"""
+
+    def __init__(self, ref_audio_path, reason):
+        super().__init__(f"Could not request results; {reason}")
+        self.ref_audio_path = ref_audio_path
+
+
+def trimmed_reference_path(audio_path):
+    """Path of the trimmed reference clip stored next to an accent file"""
+    return f"{os.path.splitext(audio_path)[0]}_trimmed.wav"
+
+
+def trim_reference(audio_path, max_duration=11):
+    """Write the first max_duration seconds of audio_path as a WAV reference clip"""
+    # Load the audio file
+    audio = AudioSegment.from_file(audio_path)
+
+    # Get duration in seconds
+    duration_sec = len(audio) / 1000
+
+    # Trim if longer than max_duration
+    if duration_sec > max_duration:
+        audio = audio[:max_duration * 1000]  # pydub works in milliseconds
+        print(f"Audio trimmed from {duration_sec:.2f}s to {max_duration}s")
+
+    # Export as WAV for speech recognition
+    output_path = trimmed_reference_path(audio_path)
+    audio.export(output_path, format="wav")
+    return output_path
+
+
+def transcribe_reference(ref_audio_path):
+    """
+    Transcribe a reference clip with Google Speech Recognition.
+
+    Returns:
+        str: The transcription, or "" if the speech was not understood
+
+    Raises:
+        ReferenceTranscriptionError: The recognition service could not be reached
+    """
+    recognizer = sr.Recognizer()
+    with sr.AudioFile(ref_audio_path) as source:
+        audio_data = recognizer.record(source)
+
+    try:
+        text = recognizer.recognize_google(audio_data)
+    except sr.UnknownValueError:
+        return ""
+    except sr.RequestError as e:
+        raise ReferenceTranscriptionError(ref_audio_path, e) from e
+    print(f"Transcription successful: {text[:50]}...")
+    return text
+
 
 def trim_and_transcribe(audio_path, max_duration=11):
     """
@@ -30,50 +103,64 @@ def trim_and_transcribe(audio_path, max_duration=11):
         tuple: (audio_path, transcription)
     """
     try:
-        # Load the audio file
-        audio = AudioSegment.from_file(audio_path)
+        output_path = trim_reference(audio_path, max_duration=max_duration)
+        try:
+            text = transcribe_reference(output_path) or "Could not understand audio"
+        except ReferenceTranscriptionError as e:
+            text = str(e)
+        return output_path, text
 
-        # Get duration in seconds
-        duration_sec = len(audio) / 1000
+    except Exception as e:
+        print(f"Error in trim_and_transcribe: {str(e)}")
+        return audio_path, "Transcription failed"
 
-        # Trim if longer than max_duration
-        if duration_sec > max_duration:
-            audio = audio[:max_duration * 1000]  # pydub works in milliseconds
-            print(f"Audio trimmed from {duration_sec:.2f}s to {max_duration}s")
 
-        # Create output path for trimmed audio
-        base_name = os.path.splitext(audio_path)[0]
-        output_path = f"{base_name}_trimmed.wav"
+def prepare_reference(audio_path, max_duration=11):
+    """
+    Trim an accent recording and transcribe it once, at save time.
 
-        # Export as WAV for speech recognition
-        audio.export(output_path, format="wav")
+    The trimmed clip is written as `<name>_trimmed.wav` next to the accent
+    file. Callers store the returned path and transcript on the saved accent
+    row, which is the only record of them.
 
-        # Convert audio to text using speech recognition
-        recognizer = sr.Recognizer()
+    Args:
+        audio_path (str): Path to the saved accent audio
+        max_duration (int): Maximum reference duration in seconds
 
-        with sr.AudioFile(output_path) as source:
-            audio_data = recognizer.record(source)
+    Returns:
+        tuple: (trimmed_audio_path, transcription) - transcription is "" if
+        the reference audio could not be understood
 
-            # Try to recognize speech
-            try:
-                text = recognizer.recognize_google(audio_data)
-                print(f"Transcription successful: {text[:50]}...")
-            except sr.UnknownValueError:
-                text = "Could not understand audio"
-            except sr.RequestError as e:
-                text = f"Could not request results; {e}"
+    Raises:
+        ReferenceTranscriptionError: Speech recognition was unreachable;
+            nothing should be stored so the next use tries again
+    """
+    try:
+        ref_audio_path = trim_reference(audio_path, max_duration=max_duration)
+    except Exception as e:
+        print(f"Error preparing reference clip: {str(e)}")
+        return audio_path, ""
+    return ref_audio_path, transcribe_reference(ref_audio_path)
 
-        return output_path, text
 
-    except Exception as e:
-        print(f"Error in trim_and_transcribe: {str(e)}")
-        return audio_path, "Transcription failed"
+def prepare_reference_or_none(audio_path, max_duration=11):
+    """prepare_reference(), or (None, None) to leave the reference unset for a retry"""
+    try:
+        return prepare_reference(audio_path, max_duration=max_duration)
+    except ReferenceTranscriptionError as e:
+        print(f"⚠️ Reference not transcribed, will retry on next use: {e}")
+        return None, None
 
 
-def split_into_sentences(text):
-    """Split text into sentences using regex"""
-    sentences = re.split(r'(?<=[.!?])\s+', text.strip())
-    return [s for s in sentences if s]
+def remove_reference(audio_path):
+    """Delete the trimmed clip stored for an accent file"""
+    path = trimmed_reference_path(audio_path)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+# Same sentences as translation and the synthesis cache; old name kept for scripts
+split_into_sentences = split_sentences
 
 
 class F5TTSSynthesizer:
@@ -104,20 +191,16 @@ class F5TTSSynthesizer:
 
         print("F5-TTS model loaded successfully!")
 
-    def generate_audio(self, text, reference_audio_path, reference_text, output_path):
+    def generate_array(self, text, reference_audio_path, reference_text):
         """
-        Generate audio using F5-TTS
+        Generate audio for one piece of text without touching the disk
 
-        Args:
-            text: Text to generate speech for
-            reference_audio_path: Path to reference audio
-            reference_text: Transcription of reference audio
-            output_path: Path to save generated audio
+        Returns:
+            tuple: (float32 numpy array, sample_rate)
         """
         print(f"Generating audio with F5-TTS for: {text[:50]}...")
 
-        # Generate audio
-        generated_audio, sr, _ = self.f5tts.infer(
+        generated_audio, sample_rate, _ = self.f5tts.infer(
             ref_file=reference_audio_path,
             ref_text=reference_text,
             gen_text=text,
@@ -128,21 +211,393 @@ class F5TTSSynthesizer:
             # temperature=0.7
         )
 
-        # Convert numpy array to torch tensor if needed
-        if isinstance(generated_audio, np.ndarray):
-            generated_audio = torch.from_numpy(generated_audio)
+        if isinstance(generated_audio, torch.Tensor):
+            generated_audio = generated_audio.squeeze().cpu().numpy()
+        return np.asarray(generated_audio, dtype=np.float32).reshape(-1), sample_rate
+
+    def generate_batch(self, sentences, reference_audio_path, reference_text, batch_size=None):
+        """
+        Generate audio for several sentences, running up to `batch_size`
+        of them through each F5-TTS forward pass.
 
-        # Ensure correct shape for torchaudio.save: [channels, samples]
-        if generated_audio.dim() == 1:
-            generated_audio = generated_audio.unsqueeze(0)  # Add channel dimension
+        Sentences are grouped by length so little work is spent on padding.
+        Sentences too long for a single pass (F5-TTS would chunk them) go
+        through generate_array(), and so does every sentence on installs
+        whose F5-TTS internals differ from the ones the batched pass uses
+        (missing modules or attributes, changed signatures).
 
-        # Save audio
-        torchaudio.save(output_path, generated_audio.cpu(), sr)
+        Returns:
+            tuple: (list of float32 numpy arrays in sentence order, sample_rate)
+        """
+        batch_size = batch_size or F5TTS_BATCH_SIZE
+        if batch_size > 1 and len(sentences) > 1:
+            try:
+                return self._generate_batched(sentences, reference_audio_path, reference_text, batch_size)
+            except (ImportError, AttributeError, TypeError) as e:
+                print(f"⚠️ Batched F5-TTS unavailable ({e}), generating sentence by sentence")
+
+        results = [self.generate_array(s, reference_audio_path, reference_text) for s in sentences]
+        sample_rate = results[0][1] if results else self.f5tts.target_sample_rate
+        return [wave for wave, _ in results], sample_rate
+
+    def _generate_batched(self, sentences, reference_audio_path, reference_text, batch_size):
+        """Batched half of generate_batch(); relies on F5-TTS internals beyond its public API"""
+        from f5_tts.infer.utils_infer import (
+            preprocess_ref_audio_text, convert_char_to_pinyin, hop_length, target_rms
+        )
+
+        # Same reference preparation F5-TTS does inside infer() (cached per clip)
+        ref_file, ref_text = preprocess_ref_audio_text(reference_audio_path, reference_text, show_info=lambda *args: None)
+        cond, ref_sr = torchaudio.load(ref_file)
+        ref_seconds = cond.shape[-1] / ref_sr
+        max_chars = int(len(ref_text.encode("utf-8")) / ref_seconds * (22 - ref_seconds))
+
+        if cond.shape[0] > 1:
+            cond = torch.mean(cond, dim=0, keepdim=True)
+        ref_rms = torch.sqrt(torch.mean(torch.square(cond)))
+        if ref_rms < target_rms:
+            cond = cond * target_rms / ref_rms
+        sample_rate = self.f5tts.target_sample_rate
+        if ref_sr != sample_rate:
+            cond = torchaudio.functional.resample(cond, ref_sr, sample_rate)
+        cond = cond.to(self.device)
+        if len(ref_text[-1].encode("utf-8")) == 1:
+            ref_text = ref_text + " "
+
+        waves = [None] * len(sentences)
+        batchable = []
+        for i, sentence in enumerate(sentences):
+            if len(sentence.encode("utf-8")) > max_chars:
+                waves[i], _ = self.generate_array(sentence, reference_audio_path, reference_text)
+            else:
+                batchable.append(i)
+
+        batchable.sort(key=lambda i: len(sentences[i].encode("utf-8")))
+        for start in range(0, len(batchable), batch_size):
+            group = batchable[start:start + batch_size]
+            print(f"Generating {len(group)} sentence(s) with F5-TTS in one pass...")
+            group_waves = self._sample_group(
+                [sentences[i] for i in group], cond, ref_text, ref_rms,
+                hop_length, target_rms, convert_char_to_pinyin
+            )
+            for i, wave in zip(group, group_waves):
+                waves[i] = wave
+
+        return waves, sample_rate
+
+    def _sample_group(self, texts, cond, ref_text, ref_rms, hop_length, target_rms, convert_char_to_pinyin):
+        """Run one batched F5-TTS sampling pass; mirrors f5_tts infer_batch_process"""
+        ref_audio_len = cond.shape[-1] // hop_length
+        ref_text_len = len(ref_text.encode("utf-8"))
+        durations = []
+        for text in texts:
+            text_len = len(text.encode("utf-8"))
+            speed = 0.3 if text_len < 10 else 1.0  # F5-TTS slows down very short text
+            durations.append(ref_audio_len + int(ref_audio_len / ref_text_len * text_len / speed))
+
+        final_text_list = convert_char_to_pinyin([ref_text + text for text in texts])
+        with torch.inference_mode():
+            generated, _ = self.f5tts.ema_model.sample(
+                cond=cond.repeat(len(texts), 1),
+                text=final_text_list,
+                duration=torch.tensor(durations, device=cond.device),
+                steps=F5TTS_NFE_STEP,
+                cfg_strength=F5TTS_CFG_STRENGTH,
+                sway_sampling_coef=F5TTS_SWAY_SAMPLING_COEF,
+            )
+
+            waves = []
+            for row, duration in zip(generated.to(torch.float32), durations):
+                mel = row[ref_audio_len:duration, :].permute(1, 0).unsqueeze(0)
+                if self.f5tts.mel_spec_type == "vocos":
+                    wave = self.f5tts.vocoder.decode(mel)
+                else:
+                    wave = self.f5tts.vocoder(mel)
+                if ref_rms < target_rms:
+                    wave = wave * ref_rms / target_rms
+                waves.append(wave.squeeze().cpu().numpy().astype(np.float32))
+        return waves
+
+    def generate_audio(self, text, reference_audio_path, reference_text, output_path):
+        """
+        Generate audio using F5-TTS
+
+        Args:
+            text: Text to generate speech for
+            reference_audio_path: Path to reference audio
+            reference_text: Transcription of reference audio
+            output_path: Path to save generated audio
+        """
+        generated_audio, sample_rate = self.generate_array(text, reference_audio_path, reference_text)
+        save_wav(output_path, generated_audio, sample_rate)
         print(f"Audio saved to: {output_path}")
         return output_path
 
 
-def synthesize_with_f5tts(text: str, speaker_wav: str, output_path: str, lang: str = "en"):
+def save_wav(output_path, audio, sample_rate):
+    """Write a mono float32 numpy array as a WAV file"""
+    torchaudio.save(output_path, torch.from_numpy(audio).unsqueeze(0), sample_rate)
+
+
+def join_with_pauses(waves, sample_rate, pause_ms=None):
+    """
+    Concatenate sentence audio with a short pause between sentences.
+
+    The output buffer is allocated once and each sentence is copied into
+    place, so joining is linear in the total length.
+    """
+    pause_ms = SENTENCE_PAUSE_MS if pause_ms is None else pause_ms
+    pause = int(sample_rate * pause_ms / 1000)
+    total = sum(len(wave) for wave in waves) + pause * max(len(waves) - 1, 0)
+    combined = np.zeros(total, dtype=np.float32)
+
+    position = 0
+    for i, wave in enumerate(waves):
+        if i:
+            position += pause
+        combined[position:position + len(wave)] = wave
+        position += len(wave)
+    return combined
+
+
+F5TTS_REPLICAS = int(os.getenv("F5TTS_REPLICAS", "1"))
+F5TTS_MODEL_TYPE = os.getenv("F5TTS_MODEL_TYPE", "F5-TTS")
+F5TTS_WARMUP = os.getenv("F5TTS_WARMUP", "1") == "1"
+
+
+class F5TTSEnginePool:
+    """
+    Process-wide holder for loaded F5-TTS models.
+
+    Models are loaded once (at startup via load() or lazily on first acquire())
+    and handed out to concurrent requests. Up to `replicas` models are kept;
+    a request that finds every replica busy waits for one to be returned.
+    """
+
+    def __init__(self, replicas=F5TTS_REPLICAS, model_type=F5TTS_MODEL_TYPE, device=None, warmup=F5TTS_WARMUP):
+        self.replicas = max(1, replicas)
+        self.model_type = model_type
+        self.device = device
+        self.warmup = warmup
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._generation = 0
+
+    def _new_replica(self):
+        started = time.perf_counter()
+        synthesizer = F5TTSSynthesizer(model_type=self.model_type, device=self.device)
+        record_model_load("f5tts", time.perf_counter() - started)
+        if self.warmup:
+            warmup_synthesizer(synthesizer)
+        return synthesizer
+
+    def load(self):
+        """Load every replica up front so the first request does not pay for it"""
+        loaded = []
+        while True:
+            with self._lock:
+                if self._created >= self.replicas:
+                    break
+                self._created += 1
+                generation = self._generation
+            try:
+                loaded.append((generation, self._new_replica()))
+            except Exception:
+                self._forget(generation)
+                raise
+        for item in loaded:
+            self._release(*item)
+        print(f"✅ F5-TTS engine pool ready: {self.replicas} replica(s)")
+
+    @contextmanager
+    def acquire(self, timeout=None):
+        """
+        Borrow a loaded F5TTSSynthesizer for the duration of a `with` block.
+
+        Args:
+            timeout: Seconds to wait for a free replica (None waits forever)
+        """
+        generation, synthesizer = self._take(timeout)
+        try:
+            yield synthesizer
+        finally:
+            self._release(generation, synthesizer)
+
+    def _take(self, timeout):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.replicas
+            if can_create:
+                self._created += 1
+            generation = self._generation
+
+        if can_create:
+            try:
+                return generation, self._new_replica()
+            except Exception:
+                self._forget(generation)
+                raise
+
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError("No F5-TTS replica became available in time")
+
+    def _forget(self, generation):
+        """Give back the slot of a replica that failed to load"""
+        with self._lock:
+            # After a reload the count belongs to the new generation
+            if generation == self._generation:
+                self._created -= 1
+
+    def _release(self, generation, synthesizer):
+        with self._lock:
+            stale = generation != self._generation
+        if stale:
+            # Replica belongs to a pool generation that was reloaded; let it be freed
+            return
+        self._idle.put((generation, synthesizer))
+
+    def reload(self, replicas=None):
+        """
+        Discard every loaded replica and load fresh ones.
+
+        Replicas currently in use finish their request and are dropped when
+        returned, so in-flight syntheses are not interrupted.
+        """
+        with self._lock:
+            self._generation += 1
+            if replicas is not None:
+                self.replicas = max(1, replicas)
+            self._created = 0
+            while True:
+                try:
+                    self._idle.get_nowait()
+                except queue.Empty:
+                    break
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+        self.load()
+
+
+def warmup_synthesizer(synthesizer):
+    """Run one short inference so lazy initialisation is not paid by the first request"""
+    print("🔥 Warming up F5-TTS...")
+    sr = 24000
+    t = torch.arange(sr * 2) / sr
+    # Two seconds of a quiet tone is enough to exercise the full inference path
+    tone = (0.1 * torch.sin(2 * torch.pi * 220 * t)).unsqueeze(0)
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
+        warmup_path = tmp.name
+    try:
+        torchaudio.save(warmup_path, tone, sr)
+        synthesizer.f5tts.infer(
+            ref_file=warmup_path,
+            ref_text="Warm up.",
+            gen_text="Hello.",
+            nfe_step=4,
+        )
+        print("✅ F5-TTS warm-up complete")
+    except Exception as e:
+        print(f"⚠️ F5-TTS warm-up failed: {e}")
+    finally:
+        try:
+            os.remove(warmup_path)
+        except OSError:
+            pass
+
+
+_engine_pool = None
+_engine_pool_lock = threading.Lock()
+
+
+def get_engine_pool() -> F5TTSEnginePool:
+    """Return the process-wide F5-TTS engine pool, creating it on first use"""
+    global _engine_pool
+    if _engine_pool is None:
+        with _engine_pool_lock:
+            if _engine_pool is None:
+                if not F5TTS_AVAILABLE:
+                    raise ImportError("F5-TTS is not installed. Install with: pip install f5-tts")
+                _engine_pool = F5TTSEnginePool()
+    return _engine_pool
+
+
+def resolve_reference(speaker_wav, lang, ref_audio_path=None, ref_text=None):
+    """
+    Return the (reference_audio_path, reference_text) F5-TTS should condition on.
+
+    Uses the reference prepared at save time when available and only
+    transcribes accents whose reference is not stored yet.
+    """
+    from pipeline.tts_generator import hindi_to_simple_roman
+
+    if ref_audio_path is None or ref_text is None:
+        print("Transcribing reference audio...")
+        try:
+            ref_audio_path, ref_text = prepare_reference(speaker_wav, max_duration=11)
+        except ReferenceTranscriptionError as e:
+            # Use the trimmed clip untranscribed for this synthesis only
+            print(f"⚠️ {e}")
+            ref_audio_path, ref_text = e.ref_audio_path, ""
+
+    if ref_text:
+        if lang == "hi" and any('\u0900' <= c <= '\u097F' for c in ref_text):
+            ref_text = hindi_to_simple_roman(ref_text)
+    else:
+        ref_text = "sample reference audio"
+
+    print(f"Reference transcription: {ref_text[:100]}...")
+    return ref_audio_path, ref_text
+
+
+def split_for_synthesis(text, lang):
+    """Split text into the sentences F5-TTS generates one at a time"""
+    # Split text into sentences for better quality
+    if lang == "hi":
+        return [text]
+    return split_sentences(text) or [text]
+
+
+def synthesis_params(ref_text):
+    """Generation settings that change F5-TTS output, for synthesis cache keys"""
+    return (F5TTS_MODEL_TYPE, F5TTS_NFE_STEP, F5TTS_CFG_STRENGTH, F5TTS_SWAY_SAMPLING_COEF, ref_text)
+
+
+def stream_with_f5tts(text: str, speaker_wav: str, lang: str = "en", ref_audio_path: str = None, ref_text: str = None):
+    """
+    Synthesize speech with F5-TTS one sentence at a time.
+
+    Yields:
+        tuple: (float32 numpy array, sample_rate) for each sentence as soon
+        as it is generated, so callers can start playback early
+    """
+    if not F5TTS_AVAILABLE:
+        raise ImportError("F5-TTS not available")
+
+    ref_audio_path, ref_text = resolve_reference(speaker_wav, lang, ref_audio_path, ref_text)
+    voice = voice_id(speaker_wav)
+    for sentence in split_for_synthesis(text, lang):
+        key = sentence_key(sentence, lang, "f5tts", voice, synthesis_params(ref_text))
+        cached = synthesis_cache.get(key)
+        if cached is not None:
+            yield decode_wave(cached)
+            continue
+
+        # Hold a replica only while generating, not while the client reads
+        with get_engine_pool().acquire() as f5tts_model, timed("f5tts", lang, "single"):
+            wave, sample_rate = f5tts_model.generate_array(sentence, ref_audio_path, ref_text)
+        synthesis_cache.put(key, encode_wave(wave, sample_rate))
+        yield wave, sample_rate
+
+
+def synthesize_with_f5tts(text: str, speaker_wav: str, output_path: str, lang: str = "en",
+                          ref_audio_path: str = None, ref_text: str = None):
     """
     Synthesize speech using F5-TTS
 
@@ -151,12 +606,12 @@ def synthesize_with_f5tts(text: str, speaker_wav: str, output_path: str, lang: s
         speaker_wav: Path to reference speaker audio
         output_path: Path to save output audio
         lang: Language code (not used in F5-TTS but kept for API compatibility)
+        ref_audio_path: Trimmed reference clip prepared when the accent was saved
+        ref_text: Transcript of ref_audio_path ("" if it could not be transcribed)
 
     Returns:
         bool: True if synthesis successful
     """
-    from pipeline.tts_generator import hindi_to_simple_roman
-
     try:
         if not F5TTS_AVAILABLE:
             raise ImportError("F5-TTS not available")
@@ -165,65 +620,27 @@ def synthesize_with_f5tts(text: str, speaker_wav: str, output_path: str, lang: s
         print(f"Text: {text}")
         print(f"Reference audio: {speaker_wav}")
 
-        # Initialize F5-TTS model (singleton pattern would be better for production)
-        f5tts_model = F5TTSSynthesizer()
-
-        # Get reference audio transcription
-        print("Transcribing reference audio...")
-        ref_audio_path, ref_text = trim_and_transcribe(speaker_wav, max_duration=11)
-
-        if ref_text not in ["Could not understand audio", "Transcription failed"]:
-            if lang == "hi" and any('\u0900' <= c <= '\u097F' for c in ref_text):
-                ref_text = hindi_to_simple_roman(ref_text)
-        else:
-            ref_text = "sample reference audio"
-
-
-        print(f"Reference transcription: {ref_text[:100]}...")
-
-        # Split text into sentences for better quality
-        # sentences = split_into_sentences(text)
-        if lang == "hi":
-            sentences = [text]
-        else:
-            sentences = split_into_sentences(text)
+        ref_audio_path, ref_text = resolve_reference(speaker_wav, lang, ref_audio_path, ref_text)
+        sentences = split_for_synthesis(text, lang)
 
         print(sentences," ", ref_audio_path, " ", ref_text, " ",output_path)
 
-        if len(sentences) > 1:
-            # Generate audio for each sentence and combine
-            temp_files = []
-            temp_dir = os.path.dirname(output_path)
-
-            for i, sentence in enumerate(sentences):
-                temp_output = os.path.join(temp_dir, f"temp_sentence_{i}.wav")
-                f5tts_model.generate_audio(sentence, ref_audio_path, ref_text, temp_output)
-                temp_files.append(temp_output)
+        voice = voice_id(speaker_wav)
+        keys = [sentence_key(sentence, lang, "f5tts", voice, synthesis_params(ref_text)) for sentence in sentences]
 
-            # Combine audio files
-            combined = AudioSegment.empty()
-            pause = AudioSegment.silent(duration=150)  # 300ms pause between sentences
+        def generate(pending):
+            # Borrow an already-loaded model instead of loading one per request
+            with get_engine_pool().acquire() as f5tts_model, timed("f5tts", lang, "batch"):
+                waves, sample_rate = f5tts_model.generate_batch(pending, ref_audio_path, ref_text)
+            return [(wave, sample_rate) for wave in waves]
 
-            for audio_file in temp_files:
-                audio_segment = AudioSegment.from_wav(audio_file)
-                combined += audio_segment + pause
+        # Sentences spoken before in this voice come from the cache
+        pieces = cached_sentences(sentences, keys, generate,
+                                  encode=lambda piece: encode_wave(*piece), decode=decode_wave)
+        sample_rate = pieces[0][1]
 
-            # Remove last pause
-            if len(temp_files) > 0:
-                combined = combined[:-300]
-
-            # Export combined audio
-            combined.export(output_path, format="wav")
-
-            # Clean up temp files
-            for temp_file in temp_files:
-                try:
-                    os.remove(temp_file)
-                except:
-                    pass
-        else:
-            # Single sentence, generate directly
-            f5tts_model.generate_audio(text, ref_audio_path, ref_text, output_path)
+        # Join in memory and write the output once
+        save_wav(output_path, join_with_pauses([wave for wave, _ in pieces], sample_rate), sample_rate)
 
         print(f"Step 3: F5-TTS synthesis completed successfully!")
         return True
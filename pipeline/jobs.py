@@ -0,0 +1,175 @@
+"""
+Background job execution for long-running pipeline requests.
+
+A POST endpoint submits a job and returns its id immediately; a worker
+pool runs the pipeline and records per-stage progress in a JobStore, which
+clients poll through GET /api/jobs/{job_id}. The default store keeps jobs
+in process memory; any JobStore subclass can be passed to JobManager
+instead (e.g. one backed by Redis or the database).
+"""
+
+import os
+import threading
+import time
+import traceback
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pipeline.executors import StageBusyError, wait_for_capacity
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_QUEUE_DEPTH = int(os.getenv("JOB_QUEUE_DEPTH", "32"))
+# Retry-After suggested when the job queue is full
+JOB_RETRY_AFTER = 30
+JOB_TTL_SECONDS = int(os.getenv("JOB_TTL_SECONDS", "3600"))
+
+
+class JobStore(ABC):
+    """Interface for job storage backends"""
+
+    @abstractmethod
+    def create(self, job: dict) -> None:
+        ...
+
+    @abstractmethod
+    def get(self, job_id: str):
+        ...
+
+    @abstractmethod
+    def update(self, job_id: str, **fields) -> None:
+        ...
+
+    @abstractmethod
+    def update_stage(self, job_id: str, stage: str, **fields) -> None:
+        ...
+
+
+class InMemoryJobStore(JobStore):
+    """
+    Keeps jobs in a dict guarded by a lock.
+
+    Finished jobs are dropped `ttl` seconds after they complete so the store
+    does not grow without bound.
+    """
+
+    def __init__(self, ttl: int = JOB_TTL_SECONDS):
+        self.ttl = ttl
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def create(self, job: dict) -> None:
+        with self._lock:
+            self._expire()
+            self._jobs[job["id"]] = job
+
+    def get(self, job_id: str):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            # Copy so callers never see a half-applied update
+            return {**job, "stages": {name: dict(stage) for name, stage in job["stages"].items()}}
+
+    def update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields, updated_at=time.time())
+
+    def update_stage(self, job_id: str, stage: str, **fields) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job["stages"].setdefault(stage, {}).update(fields)
+                job["updated_at"] = time.time()
+
+    def _expire(self):
+        cutoff = time.time() - self.ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job["status"] in ("completed", "failed") and job["updated_at"] < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+class JobProgress:
+    """Callable handed to pipeline functions to report stage transitions"""
+
+    def __init__(self, store: JobStore, job_id: str):
+        self.store = store
+        self.job_id = job_id
+
+    def __call__(self, stage: str, status: str, **details):
+        fields = {"status": status, **details}
+        if status == "running":
+            fields["started_at"] = time.time()
+        elif status in ("completed", "failed", "skipped"):
+            fields["finished_at"] = time.time()
+        self.store.update_stage(self.job_id, stage, **fields)
+
+
+class JobManager:
+    """Runs submitted jobs on a bounded worker pool and tracks them in a JobStore"""
+
+    def __init__(self, store: JobStore = None, workers: int = JOB_WORKERS, queue_depth: int = JOB_QUEUE_DEPTH):
+        self.store = store or InMemoryJobStore()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._slots = threading.BoundedSemaphore(workers + queue_depth)
+
+    def submit(self, kind: str, stages: list, fn, *args, **kwargs) -> str:
+        """
+        Queue `fn(*args, progress=..., **kwargs)` and return the new job id.
+
+        Args:
+            kind: Job type shown to clients (e.g. "translate")
+            stages: Stage names the pipeline will report, listed up front
+                so clients can render progress before work starts
+            fn: Pipeline function; its return value becomes the job result
+
+        Raises:
+            StageBusyError: If the job queue is full
+        """
+        if not self._slots.acquire(blocking=False):
+            raise StageBusyError("jobs", JOB_RETRY_AFTER)
+
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self.store.create({
+            "id": job_id,
+            "kind": kind,
+            "status": "queued",
+            "stages": {stage: {"status": "pending"} for stage in stages},
+            "result": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+        })
+        self._executor.submit(self._run, job_id, fn, args, kwargs)
+        return job_id
+
+    def get(self, job_id: str):
+        return self.store.get(job_id)
+
+    def _run(self, job_id, fn, args, kwargs):
+        self.store.update(job_id, status="running")
+        try:
+            # Admitted jobs queue for model stages instead of being rejected
+            with wait_for_capacity():
+                result = fn(*args, progress=JobProgress(self.store, job_id), **kwargs)
+        except Exception as e:
+            traceback.print_exc()
+            detail = getattr(e, "detail", None) or str(e)
+            self.store.update(job_id, status="failed", error=detail)
+            print(f"❌ Job {job_id} failed: {detail}")
+        else:
+            self.store.update(job_id, status="completed", result=result)
+            print(f"✅ Job {job_id} completed")
+        finally:
+            self._slots.release()
+
+
+def report(progress, stage: str, status: str, **details):
+    """Report a stage transition if the caller is tracking progress"""
+    if progress is not None:
+        progress(stage, status, **details)
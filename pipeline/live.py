@@ -0,0 +1,174 @@
+"""
+Live interpretation of microphone audio.
+
+A LiveInterpreter is fed raw PCM frames as they arrive. Every
+LIVE_PARTIAL_INTERVAL_MS of new audio it re-transcribes the rolling window
+of not-yet-finalized speech and reports the text as a partial transcript.
+Sentences that Whisper has closed with punctuation and that are followed by
+enough audio to be stable are finalized and dropped from the window; each
+final sentence is then translated and synthesized on its own.
+
+WebSocket protocol (see /ws/interpret in main.py):
+    client -> server  JSON config, then binary frames of 16-bit little-endian
+                      mono PCM at config["sample_rate"]; {"type": "stop"}
+                      flushes the remaining speech and closes the session
+    server -> client  {"type": "partial", "text"}
+                      {"type": "final", "sentence", "text"}
+                      {"type": "translation", "sentence", "text"}
+                      {"type": "audio_start", "sentence", "media_type", "model"},
+                      binary audio chunks, {"type": "audio_end", "sentence"}
+"""
+
+import os
+
+import numpy as np
+
+from pipeline.audio_io import WHISPER_SAMPLE_RATE, resample
+from pipeline.executors import StageBusyError, run_stage, stream_on_stage, wait_for_capacity
+from pipeline.lang_code import nllb_to_whisper_lang_code, whisper_to_nllb_lang_code
+from pipeline.text_postprocessor import SENTENCE_END, clean_transcription, clean_translation
+from pipeline.transcriber import detect_language, has_speech, transcribe_segments
+from pipeline.translator import translate
+from pipeline.tts_generator import synthesis_stage, synthesize_accent_stream
+
+# New audio between two partial transcripts
+LIVE_PARTIAL_INTERVAL_MS = int(os.getenv("LIVE_PARTIAL_INTERVAL_MS", "500"))
+# Audio that must follow a sentence before it is considered final
+LIVE_SETTLE_MS = int(os.getenv("LIVE_SETTLE_MS", "700"))
+# Longest window re-transcribed; beyond it everything but the last segment is
+# finalized, and older audio is dropped even when nothing could be finalized
+LIVE_MAX_WINDOW_SECONDS = float(os.getenv("LIVE_MAX_WINDOW_SECONDS", "15"))
+# Shortest window worth sending to Whisper
+LIVE_MIN_WINDOW_MS = 300
+
+
+def pcm16_to_float(frame: bytes) -> np.ndarray:
+    return np.frombuffer(frame, dtype="<i2").astype(np.float32) / 32768.0
+
+
+class LiveInterpreter:
+    """
+    Incremental transcription state for one live session.
+
+    Args:
+        source_lang: NLLB code of the speaker's language, or "auto" to
+            identify it from the first window of speech
+        target_lang: NLLB code to translate into
+        tts_lang: Language code passed to synthesis
+        sample_rate: Sample rate of the incoming PCM frames
+        accent: Saved accent dict (file_path, ref_audio_path, ref_text) for
+            voice cloning, or None for the default voice
+    """
+
+    def __init__(self, source_lang: str, target_lang: str, tts_lang: str,
+                 sample_rate: int = WHISPER_SAMPLE_RATE, accent: dict = None):
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.tts_lang = tts_lang
+        self.sample_rate = sample_rate
+        self.accent = accent
+        self.language = None if source_lang == "auto" else nllb_to_whisper_lang_code(source_lang.split('_')[0])
+        self.sentences = 0
+
+        self._window = np.zeros(0, dtype=np.float32)
+        self._since_decode = 0
+        self._partial = ""
+
+    def feed(self, frame: bytes) -> list:
+        """Add a PCM frame; returns the transcript events it produced, if any"""
+        samples = resample(pcm16_to_float(frame), self.sample_rate, WHISPER_SAMPLE_RATE)
+        self._window = np.concatenate((self._window, samples))
+        self._since_decode += len(samples)
+
+        if self._since_decode < LIVE_PARTIAL_INTERVAL_MS * WHISPER_SAMPLE_RATE // 1000:
+            return []
+        self._since_decode = 0
+        try:
+            return self._decode(final=False)
+        except StageBusyError:
+            # Skip this partial; the audio stays in the window for the next one
+            return []
+
+    def flush(self) -> list:
+        """Finalize whatever speech is left in the window"""
+        with wait_for_capacity():
+            return self._decode(final=True)
+
+    def _decode(self, final: bool) -> list:
+        if len(self._window) < LIVE_MIN_WINDOW_MS * WHISPER_SAMPLE_RATE // 1000:
+            return []
+
+        window = self._window
+        if not has_speech(window):
+            # Silence (e.g. an open mic before anyone speaks) is not sent to
+            # Whisper; a short tail is kept so speech starting at the edge survives
+            tail = 0 if final else LIVE_SETTLE_MS * WHISPER_SAMPLE_RATE // 1000
+            self._window = window[len(window) - tail:]
+            if self._partial:
+                self._partial = ""
+                return [{"type": "partial", "text": ""}]
+            return []
+
+        if self.source_lang == "auto":
+            whisper_lang, _ = run_stage("transcribe", detect_language, window)
+            source_lang = whisper_to_nllb_lang_code(whisper_lang)
+            if source_lang is not None:
+                self.source_lang, self.language = source_lang, whisper_lang
+
+        segments = run_stage("transcribe", transcribe_segments, window, language=self.language)
+        window_seconds = len(window) / WHISPER_SAMPLE_RATE
+
+        if final:
+            settled = len(segments)
+        else:
+            settled = 0
+            stable_until = window_seconds - LIVE_SETTLE_MS / 1000
+            for _, end, text in segments:
+                if end > stable_until or not SENTENCE_END.search(text.strip()):
+                    break
+                settled += 1
+            if window_seconds > LIVE_MAX_WINDOW_SECONDS:
+                settled = max(settled, len(segments) - 1)
+
+        events = []
+        for _, _, text in segments[:settled]:
+            text = clean_transcription(text.strip())
+            if text:
+                self.sentences += 1
+                events.append({"type": "final", "sentence": self.sentences, "text": text})
+
+        if final:
+            self._window = np.zeros(0, dtype=np.float32)
+        elif settled:
+            # Keep only the audio after the last finalized sentence
+            cut = int(segments[settled - 1][1] * WHISPER_SAMPLE_RATE)
+            self._window = self._window[cut:]
+
+        max_samples = int(LIVE_MAX_WINDOW_SECONDS * WHISPER_SAMPLE_RATE)
+        if len(self._window) > max_samples:
+            # Hard cap, so re-transcription cost stays bounded
+            self._window = self._window[-max_samples:]
+
+        partial = " ".join(text.strip() for _, _, text in segments[settled:])
+        if partial != self._partial:
+            self._partial = partial
+            events.append({"type": "partial", "text": partial})
+        return events
+
+    def translate(self, text: str) -> str:
+        """Translate one finalized sentence"""
+        if self.source_lang in ("auto", self.target_lang):
+            return text
+        with wait_for_capacity():
+            return clean_translation(run_stage("translate", translate, text, self.source_lang, self.target_lang))
+
+    def speak(self, text: str):
+        """
+        Start synthesizing one translated sentence.
+
+        Returns:
+            tuple: (info dict with model/voice/media_type, iterator of bytes)
+        """
+        with wait_for_capacity():
+            info, chunks = synthesize_accent_stream(text, self.tts_lang, self.accent)
+            return info, stream_on_stage(synthesis_stage(info["model"]), chunks)
@@ -0,0 +1,109 @@
+"""
+Prometheus metrics for the translation pipeline, served at /metrics.
+
+Hot paths only record a duration into a histogram (two perf_counter calls
+and one observe). Everything that already exists as state
+elsewhere (stage queue depths and in-flight counts, cache hit counters) is
+read at scrape time by a collector instead of being mirrored on every call.
+
+Labels:
+    stage      denoise, ffmpeg_convert, whisper, whisper_language_id,
+               google_asr, nllb, romanize, f5tts, gtts, file_io
+    lang_pair  "source->target" for translation, the language code for
+               single-language stages, "" where it does not apply
+    backend    implementation or variant, e.g. nllb-int8, sequential, gemini
+"""
+
+import time
+from contextlib import contextmanager
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+# Model stages take from tens of milliseconds (cached, short text) to minutes
+STAGE_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+STAGE_SECONDS = Histogram(
+    "translator_stage_seconds",
+    "Time spent in a pipeline stage",
+    ["stage", "lang_pair", "backend"],
+    buckets=STAGE_BUCKETS
+)
+MODEL_LOAD_SECONDS = Gauge(
+    "translator_model_load_seconds",
+    "Time the most recent load of a model took",
+    ["model"]
+)
+
+
+def language_pair(source_lang: str, target_lang: str) -> str:
+    return f"{source_lang}->{target_lang}"
+
+
+def observe_stage(stage: str, seconds: float, lang_pair: str = "", backend: str = "") -> None:
+    STAGE_SECONDS.labels(stage, lang_pair, backend).observe(seconds)
+
+
+@contextmanager
+def timed(stage: str, lang_pair: str = "", backend: str = ""):
+    """Record the duration of a `with` block in the stage histogram"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - started, lang_pair, backend)
+
+
+def record_model_load(model: str, seconds: float) -> None:
+    MODEL_LOAD_SECONDS.labels(model).set(seconds)
+
+
+class PipelineCollector:
+    """Reads stage executor and cache state at scrape time"""
+
+    def __init__(self):
+        self._caches = {}
+
+    def register_cache(self, name: str, cache) -> None:
+        """
+        Expose a cache's stats(); it must report "hits" and "misses" counts
+        """
+        self._caches[name] = cache
+
+    def collect(self):
+        # Imported here so recording metrics never pulls in the executors
+        from pipeline.executors import STAGES
+
+        queued = GaugeMetricFamily("translator_stage_queue_depth", "Requests waiting for a stage worker", labels=["stage"])
+        in_flight = GaugeMetricFamily("translator_stage_in_flight", "Requests running on a stage", labels=["stage"])
+        concurrency = GaugeMetricFamily("translator_stage_concurrency", "Worker threads of a stage", labels=["stage"])
+        for name, executor in STAGES.items():
+            queued.add_metric([name], executor.queued)
+            in_flight.add_metric([name], executor.in_flight)
+            concurrency.add_metric([name], executor.concurrency)
+        yield queued
+        yield in_flight
+        yield concurrency
+
+        hits = CounterMetricFamily("translator_cache_hits", "Cache lookups that found an entry", labels=["cache"])
+        misses = CounterMetricFamily("translator_cache_misses", "Cache lookups that found nothing", labels=["cache"])
+        ratio = GaugeMetricFamily("translator_cache_hit_ratio", "Hits over lookups since start", labels=["cache"])
+        for name, cache in self._caches.items():
+            stats = cache.stats()
+            lookups = stats["hits"] + stats["misses"]
+            hits.add_metric([name], stats["hits"])
+            misses.add_metric([name], stats["misses"])
+            ratio.add_metric([name], stats["hits"] / lookups if lookups else 0.0)
+        yield hits
+        yield misses
+        yield ratio
+
+
+collector = PipelineCollector()
+REGISTRY.register(collector)
+register_cache = collector.register_cache
+
+
+def render_metrics() -> tuple:
+    """(body, content type) of the Prometheus text exposition"""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -6,94 +6,110 @@ which uses AI to separate speech from noisy audio and improve overall quality.
 """
 
 import os
-import torch
-import torchaudio
 from resemble_enhance.enhancer.inference import denoise
+from pipeline.audio_buffer import AudioBuffer
+from pipeline.disk_cache import DiskLRUCache
+from pipeline.metrics import timed
 
+# Denoised outputs keyed by the input's content hash and the settings below,
+# so re-submitting the same clip skips the model entirely.
+# Set DENOISE_CACHE_DIR="" to disable.
+DENOISE_CACHE_DIR = os.getenv("DENOISE_CACHE_DIR", "cache/denoise")
+DENOISE_CACHE_MAX_BYTES = int(os.getenv("DENOISE_CACHE_MAX_BYTES", str(2 * 1024**3)))
+DENOISE_SAMPLE_RATE = 44100
+# Bump when the denoising steps change so stale outputs are not reused
+DENOISE_CACHE_VERSION = 3
 
-def denoise_audio(input_path: str, output_path: str, device: str = "cpu") -> str:
+denoise_cache = DiskLRUCache(DENOISE_CACHE_DIR, DENOISE_CACHE_MAX_BYTES, suffix=".wav")
+
+
+def denoise_cache_key(buffer: AudioBuffer) -> str:
+    return f"{buffer.content_hash}-resemble-enhance-{DENOISE_SAMPLE_RATE}-v{DENOISE_CACHE_VERSION}"
+
+
+def denoise_buffer(buffer: AudioBuffer, device: str = "cpu") -> AudioBuffer:
     """
-    Denoise audio using Resemble Enhance AI model.
+    Denoise in-memory audio using Resemble Enhance AI model.
 
     This function:
-    1. Loads the input audio file
-    2. Converts to mono if stereo
-    3. Resamples to 44.1kHz (required by Resemble Enhance)
-    4. Applies AI-based denoising
-    5. Saves the denoised audio
+    1. Converts to mono if stereo
+    2. Resamples to 44.1kHz (required by Resemble Enhance)
+    3. Applies AI-based denoising
 
     Args:
-        input_path: Path to input audio file (any format supported by torchaudio)
-        output_path: Path to save denoised audio (will be saved as WAV)
+        buffer: Decoded input audio
         device: Device to run inference on ("cpu" or "cuda")
 
     Returns:
-        Path to denoised audio file
-
-    Raises:
-        FileNotFoundError: If input file doesn't exist
-        ValueError: If audio processing fails
+        Denoised mono audio, or the input buffer if denoising fails
     """
-    print(f"🎵 Denoising audio with Resemble Enhance: {input_path}")
+    print(f"🎵 Denoising audio with Resemble Enhance ({buffer.duration:.2f}s, "
+          f"{buffer.rate} Hz, {buffer.channels} channel(s))")
+
+    # Reuse the output of an earlier identical upload
+    cache_key = None
+    if denoise_cache.enabled:
+        cache_key = denoise_cache_key(buffer)
+        cached = denoise_cache.get(cache_key)
+        if cached is not None:
+            print("✅ Denoised audio reused from cache")
+            return AudioBuffer.from_bytes(cached)
 
     try:
-        # Check if input file exists
-        if not os.path.exists(input_path):
-            raise FileNotFoundError(f"Input file not found: {input_path}")
-
-        # Load audio
-        wav, sr = torchaudio.load(input_path)
-        print(f"  Original sample rate: {sr} Hz, channels: {wav.shape[0]}, duration: {wav.shape[1]/sr:.2f}s")
-
-        # Convert to mono if stereo (average channels)
-        if wav.shape[0] > 1:
-            wav = torch.mean(wav, dim=0)  # Average channels to mono
-            print("  ✓ Converted stereo to mono")
-        else:
-            wav = wav.squeeze(0)  # Remove channel dimension if already mono [1, N] -> [N]
-
-        # Validate waveform shape
-        if wav.dim() != 1:
-            raise ValueError(f"Expected 1D waveform after processing, got {wav.dim()}D with shape {wav.shape}")
-
-        # Resample to 44.1kHz (required by Resemble Enhance)
-        if sr != 44100:
-            resampler = torchaudio.transforms.Resample(sr, 44100)
-            wav = resampler(wav)
-            sr = 44100
-            print(f"  ✓ Resampled to 44.1kHz")
-
-        # Move to specified device (cpu or cuda)
-        wav = wav.to(device)
+        # Convert to mono and resample to 44.1kHz
+        wav = buffer.mono().resample(DENOISE_SAMPLE_RATE).to_tensor().to(device)
         print(f"  ✓ Using device: {device}")
 
         # Apply Resemble Enhance denoising
         print("  🔄 Applying AI denoising (this may take a moment)...")
-        denoised_wav, denoised_sr = denoise(wav, sr, device=device)
+        with timed("denoise", backend="resemble_enhance"):
+            denoised_wav, denoised_sr = denoise(wav, DENOISE_SAMPLE_RATE, device=device)
         print("  ✓ Denoising complete")
 
-        # Ensure output directory exists
-        os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
+        result = AudioBuffer.from_tensor(denoised_wav, denoised_sr)
+    except Exception as e:
+        print(f"❌ Audio denoising failed: {e}")
+        print("   Using original audio")
+        # If denoising fails, continue with the original audio
+        return buffer
 
-        # Move back to CPU for saving
-        denoised_wav = denoised_wav.cpu()
+    if cache_key is not None:
+        denoise_cache.put(cache_key, result.to_wav_bytes(subtype="FLOAT"))
+    return result
 
-        # Ensure correct shape for saving (add channel dimension if needed)
-        if denoised_wav.dim() == 1:
-            denoised_wav = denoised_wav.unsqueeze(0)  # [N] -> [1, N]
 
-        # Save denoised audio
-        torchaudio.save(output_path, denoised_wav, denoised_sr)
-        print(f"✅ Denoised audio saved to: {output_path}")
+def denoise_audio(input_path: str, output_path: str, device: str = "cpu") -> str:
+    """
+    Denoise an audio file using Resemble Enhance AI model.
 
-        return output_path
+    File-based wrapper around denoise_buffer().
 
-    except Exception as e:
-        print(f"❌ Audio denoising failed: {e}")
-        print(f"   Using original audio: {input_path}")
+    Args:
+        input_path: Path to input audio file
+        output_path: Path to save denoised audio (will be saved as WAV)
+        device: Device to run inference on ("cpu" or "cuda")
+
+    Returns:
+        Path to denoised audio file
+
+    Raises:
+        FileNotFoundError: If input file doesn't exist
+    """
+    if not os.path.exists(input_path):
+        raise FileNotFoundError(f"Input file not found: {input_path}")
+
+    buffer = AudioBuffer.from_file(input_path)
+    denoised = denoise_buffer(buffer, device=device)
+    if denoised is buffer:
         # If denoising fails, return original path as fallback
         return input_path
 
+    # Ensure output directory exists
+    os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
+    denoised.save(output_path)
+    print(f"✅ Denoised audio saved to: {output_path}")
+    return output_path
+
 
 def denoise_audio_simple(input_path: str, output_path: str) -> str:
     """
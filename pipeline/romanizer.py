@@ -0,0 +1,200 @@
+"""
+Hindi (Devanagari) to Roman script for F5-TTS voice cloning.
+
+The local backend uses indic_transliteration's ITRANS output, rewritten
+into the plain phonetic spelling F5-TTS reads best (aa/ee/oo for long
+vowels, no capitals or diacritic markers) with word-final schwa deletion,
+so "कमल" becomes "kamal" rather than "kamala". When GEMINI_API_KEY is set,
+Gemini is used instead unless HINDI_ROMANIZER=local; all sentences that are
+not cached yet go out in a single request on one shared client, and the
+local path is the fallback if that request fails.
+
+Romanizations are cached per sentence in memory and in SQLite.
+"""
+
+import json
+import os
+import re
+import threading
+
+from indic_transliteration import sanscript
+from indic_transliteration.sanscript import transliterate
+from pipeline.kv_cache import TwoTierCache
+from pipeline.metrics import timed
+from pipeline.text_postprocessor import split_sentences
+
+try:
+    import google.genai as genai
+except ImportError:
+    genai = None
+
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+# "local" (offline transliteration) or "gemini"; Gemini by default when a key is configured
+HINDI_ROMANIZER = os.getenv("HINDI_ROMANIZER", "gemini" if GEMINI_API_KEY else "local")
+GEMINI_MODEL = os.getenv("HINDI_ROMANIZER_GEMINI_MODEL", "gemini-2.0-flash")
+
+# Set ROMANIZATION_CACHE_PATH="" to keep the cache in memory only
+ROMANIZATION_CACHE_PATH = os.getenv("ROMANIZATION_CACHE_PATH", "cache/romanizations.sqlite3")
+ROMANIZATION_CACHE_ITEMS = int(os.getenv("ROMANIZATION_CACHE_ITEMS", "10000"))
+# Bump when the local spelling rules change so stale romanizations are not reused
+ROMANIZER_VERSION = 2
+
+DEVANAGARI = re.compile(r'[\u0900-\u097F]')
+DEVANAGARI_RUN = re.compile(r'[\u0900-\u097F]+')
+# A consonant (optionally with nukta) ending a word of two or more letters
+# keeps no inherent "a" in spoken Hindi; a virama makes that explicit
+FINAL_CONSONANT = re.compile(r'(?<=[\u0900-\u097F])([\u0915-\u0939\u0958-\u095F]\u093C?)(?![\u0900-\u097F])')
+
+# ITRANS -> simple TTS spelling, applied in order (longer patterns first)
+ITRANS_TO_TTS = [
+    (r'RR[iI]|R\^[iI]', 'ri'),
+    (r'LL[iI]|L\^[iI]', 'li'),
+    (r'OM', 'om'),
+    (r'GY|j~n', 'gy'),
+    (r'~N|~n|\.N|\.n', 'n'),
+    (r'\.Dh', 'rh'),
+    (r'\.D', 'r'),
+    (r'Ch', 'chh'),
+    (r'Sh', 'sh'),
+    (r'Th', 'th'),
+    (r'Dh', 'dh'),
+    (r'M(?=[pbm])', 'm'),
+    (r'M', 'n'),
+    (r'H', 'h'),
+    (r'A', 'aa'),
+    (r'I', 'ee'),
+    (r'U', 'oo'),
+    (r'T', 't'),
+    (r'D', 'd'),
+    (r'N', 'n'),
+    (r'K', 'kh'),
+    (r'G', 'gh'),
+    (r'Y', 'y'),
+    (r'L', 'l'),
+    (r'x', 'ksh'),
+    (r'\^', ''),
+    # Leftover markers (nukta, avagraha) inside words
+    (r'\.(?=[A-Za-z])', ''),
+]
+ITRANS_TO_TTS = [(re.compile(pattern), replacement) for pattern, replacement in ITRANS_TO_TTS]
+
+# Loanword vowels ITRANS has no letters for, spelled with their closest native vowel
+LOANWORD_VOWELS = str.maketrans({
+    "\u0911": "\u0913",  # ऑ -> ओ
+    "\u0949": "\u094B",  # ॉ -> ो
+    "\u090D": "\u090F",  # ऍ -> ए
+    "\u0945": "\u0947",  # ॅ -> े
+})
+LOANWORD_VOWEL = re.compile(r'[\u0911\u0949\u090D\u0945]')
+# In a loanword फ is an "f" even without its nukta (ऑफिस "office" -> "ofis")
+LOANWORD_PHA = re.compile(r'\u092B(?!\u093C)')
+
+romanization_cache = TwoTierCache(ROMANIZATION_CACHE_PATH, "romanizations", ROMANIZATION_CACHE_ITEMS)
+
+_gemini_client = None
+_gemini_lock = threading.Lock()
+
+
+def has_devanagari(text: str) -> bool:
+    return DEVANAGARI.search(text) is not None
+
+
+def _romanize_run(match) -> str:
+    word = match.group(0)
+    if LOANWORD_VOWEL.search(word):
+        word = LOANWORD_PHA.sub("\u092B\u093C", word)
+    roman = transliterate(word.translate(LOANWORD_VOWELS), sanscript.DEVANAGARI, sanscript.ITRANS)
+    for pattern, replacement in ITRANS_TO_TTS:
+        roman = pattern.sub(replacement, roman)
+    # Anything ITRANS passed through untouched must not reach F5-TTS
+    return DEVANAGARI.sub("", roman)
+
+
+def local_romanize(text: str) -> str:
+    """Offline Devanagari -> TTS-friendly Roman spelling; other scripts pass through"""
+    text = text.replace("॥", ".").replace("।", ".")
+    text = FINAL_CONSONANT.sub("\\1\u094D", text)
+    # Only Devanagari runs are rewritten, so mixed-in English keeps its spelling
+    return DEVANAGARI_RUN.sub(_romanize_run, text).lower()
+
+
+def get_gemini_client():
+    """One Gemini client per process (it pools its HTTP connections)"""
+    global _gemini_client
+    if _gemini_client is None:
+        with _gemini_lock:
+            if _gemini_client is None:
+                _gemini_client = genai.Client(api_key=GEMINI_API_KEY)
+    return _gemini_client
+
+
+def gemini_romanize_many(texts: list) -> list:
+    """Romanize several Hindi strings with a single Gemini request"""
+    prompt = (
+        "Convert each Hindi text in this JSON list to Romanized Hindi for TTS.\n"
+        "Use simple phonetic spelling. Answer with only a JSON list of strings, "
+        "in the same order.\n\n" + json.dumps(texts, ensure_ascii=False)
+    )
+    response = get_gemini_client().models.generate_content(
+        model=GEMINI_MODEL,
+        contents=[{"role": "user", "parts": [{"text": prompt}]}]
+    )
+    answer = response.text.strip()
+    # Tolerate a ```json fenced answer
+    answer = re.sub(r'^```(?:json)?\s*|\s*```$', '', answer)
+    romans = json.loads(answer)
+    if not isinstance(romans, list) or len(romans) != len(texts):
+        raise ValueError(f"expected {len(texts)} romanizations, got {answer[:100]!r}")
+    return [str(roman).strip().strip('"\'').lower() for roman in romans]
+
+
+def _backend() -> str:
+    if HINDI_ROMANIZER == "gemini":
+        if genai is None or not GEMINI_API_KEY:
+            print("⚠️ Gemini romanizer unavailable (no google-genai or GEMINI_API_KEY), using local transliteration")
+            return "local"
+        return "gemini"
+    return "local"
+
+
+def romanize_many(texts: list) -> list:
+    """Romanize a list of Hindi strings, using the cache and at most one remote request"""
+    backend = _backend()
+    # Entries are tied to the rules version or Gemini model that produced them
+    variant = f"local-v{ROMANIZER_VERSION}" if backend == "local" else f"gemini-{GEMINI_MODEL}"
+    keys = [f"{variant}\x1f{' '.join(text.split())}" for text in texts]
+    results = [romanization_cache.get(key) for key in keys]
+
+    missing = {}
+    for key, text, result in zip(keys, texts, results):
+        if result is None and key not in missing:
+            missing[key] = text
+    if missing:
+        pending = list(missing.values())
+        fresh = None
+        if backend == "gemini":
+            try:
+                with timed("romanize", "hi", "gemini"):
+                    fresh = gemini_romanize_many(pending)
+            except Exception as e:
+                print(f"❌ Gemini romanization failed, using local transliteration: {e}")
+        # A local fallback is not stored under the Gemini backend's keys
+        cacheable = fresh is not None or backend == "local"
+        if fresh is None:
+            with timed("romanize", "hi", "local"):
+                fresh = [local_romanize(text) for text in pending]
+        if cacheable:
+            for key, roman in zip(missing, fresh):
+                romanization_cache.put(key, roman)
+        fresh_by_key = dict(zip(missing, fresh))
+        results = [fresh_by_key.get(key, result) if result is None else result for key, result in zip(keys, results)]
+
+    return results
+
+
+def romanize_hindi(text: str) -> str:
+    """Romanize Hindi text sentence by sentence; text without Devanagari is only lowercased"""
+    text = text.strip()
+    if not has_devanagari(text):
+        return text.lower()
+    return " ".join(romanize_many(split_sentences(text)))
@@ -0,0 +1,220 @@
+"""
+Speech-to-speech translation as a sentence-level pipeline.
+
+One request runs denoise -> transcribe -> translate -> synthesize. Denoising
+works on the whole recording, but after that the stages overlap: every
+sentence faster-whisper finishes is handed to a translator thread and then
+to a synthesizer thread while decoding carries on, so the total latency
+approaches that of the slowest stage instead of the sum of all of them.
+Each stage still runs its model work on the bounded stage executors.
+
+Events are produced in order for every sentence (see SpeechPipeline.events):
+    {"type": "start", "source_lang", "target_lang", "detected_language", "enhanced_audio"}
+    {"type": "transcript", "sentence", "text"}
+    {"type": "translation", "sentence", "text"}
+    {"type": "audio", "sentence", "media_type", "model", "data"}  (base64)
+    {"type": "error", "stage", "detail"}
+    {"type": "done", "sentences", "transcription", "translation"}
+"""
+
+import base64
+import json
+import queue
+import threading
+
+from pipeline.audio_buffer import AudioBuffer
+from pipeline.executors import run_stage, stream_on_stage, wait_for_capacity
+from pipeline.lang_code import nllb_to_whisper_lang_code, whisper_to_nllb_lang_code
+from pipeline.resemble_enhance_denoiser import denoise_buffer
+from pipeline.text_postprocessor import SENTENCE_END, clean_transcription, clean_translation, split_sentences
+from pipeline.transcriber import detect_language, iter_segments, transcribe_hindi
+from pipeline.translator import translate
+from pipeline.tts_generator import synthesis_stage, synthesize_accent_stream
+
+_END = object()
+
+
+class UnsupportedLanguageError(ValueError):
+    """The detected spoken language has no NLLB code"""
+
+    def __init__(self, language: str):
+        super().__init__(f"Detected language '{language}' is not supported for translation")
+        self.language = language
+
+
+class SpeechPipeline:
+    """
+    Stage threads and queues for one speech-to-speech request.
+
+    Args:
+        audio_bytes: Uploaded recording, any format the decoder understands
+        source_lang: NLLB code of the spoken language, or "auto"
+        target_lang: NLLB code to translate into
+        tts_lang: Language code passed to synthesis
+        accent: Saved accent dict (file_path, ref_audio_path, ref_text) for
+            voice cloning, or None for the default voice
+        enhanced_path: Where to save the denoised recording, if anywhere
+    """
+
+    def __init__(self, audio_bytes: bytes, source_lang: str, target_lang: str, tts_lang: str,
+                 accent: dict = None, enhanced_path: str = None):
+        self.audio_bytes = audio_bytes
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.tts_lang = tts_lang
+        self.accent = accent
+        self.enhanced_path = enhanced_path
+        self.detected_language = None
+
+        self._events = queue.Queue()
+        self._translate_queue = queue.Queue()
+        self._synthesize_queue = queue.Queue()
+        self._cancelled = threading.Event()
+        self._transcripts = []
+        self._translations = []
+
+    def start(self) -> None:
+        """
+        Denoise, pick the language and begin transcription, then start the
+        stage threads.
+
+        Runs on the caller's thread so a full denoise stage raises
+        StageBusyError (and an undetectable language UnsupportedLanguageError)
+        while an error response can still be sent.
+        """
+        upload = AudioBuffer.from_bytes(self.audio_bytes)
+        self.audio_bytes = None
+        # Admission is checked once, on denoise; later stages wait for a
+        # slot rather than reject a request that is already under way
+        denoised = run_stage("denoise", denoise_buffer, upload)
+        with wait_for_capacity():
+            if self.enhanced_path:
+                denoised.save(self.enhanced_path)
+
+            speech_audio = denoised.for_whisper()
+            whisper_lang = None
+            if self.source_lang == "auto":
+                whisper_lang, _ = run_stage("transcribe", detect_language, speech_audio)
+                source_lang = whisper_to_nllb_lang_code(whisper_lang)
+                if source_lang is None:
+                    raise UnsupportedLanguageError(whisper_lang)
+                self.source_lang = self.detected_language = source_lang
+
+            if self.source_lang == "hin_Deva":
+                # Google recognizes the whole (undenoised) recording at once; its
+                # sentences still go through translation and synthesis one by one
+                hindi_audio = upload.for_whisper()
+                text = run_stage("transcribe", transcribe_hindi, hindi_audio)
+                if text:
+                    segments = iter((None, None, sentence) for sentence in split_sentences(text))
+                else:
+                    print("🔄 Google failed, falling back to Whisper Hindi")
+                    segments = stream_on_stage("transcribe", run_stage("transcribe", iter_segments, hindi_audio, language="hi"))
+            else:
+                language = whisper_lang or nllb_to_whisper_lang_code(self.source_lang.split('_')[0])
+                segments = stream_on_stage("transcribe", run_stage("transcribe", iter_segments, speech_audio, language=language))
+
+            self._events.put({
+                "type": "start",
+                "source_lang": self.source_lang,
+                "target_lang": self.target_lang,
+                "detected_language": self.detected_language,
+                "enhanced_audio": self.enhanced_path
+            })
+            for target, args in (
+                (self._transcribe_worker, (segments,)),
+                (self._translate_worker, ()),
+                (self._synthesize_worker, ()),
+            ):
+                threading.Thread(target=target, args=args, daemon=True).start()
+
+    def events(self):
+        """Yield event dicts as the stages produce them, until the pipeline finishes"""
+        try:
+            while (event := self._events.get()) is not _END:
+                yield event
+        finally:
+            # Stops the stage threads early if the client goes away
+            self._cancelled.set()
+
+    def ndjson(self):
+        """events() as newline-delimited JSON"""
+        for event in self.events():
+            yield json.dumps(event, ensure_ascii=False) + "\n"
+
+    def _fail(self, stage: str, error: Exception) -> None:
+        print(f"❌ Speech pipeline {stage} failed: {error}")
+        self._events.put({"type": "error", "stage": stage, "detail": str(error)})
+        self._cancelled.set()
+
+    def _emit_sentence(self, text: str) -> None:
+        text = clean_transcription(text)
+        if not text:
+            return
+        self._transcripts.append(text)
+        sentence = len(self._transcripts)
+        self._events.put({"type": "transcript", "sentence": sentence, "text": text})
+        self._translate_queue.put((sentence, text))
+
+    def _transcribe_worker(self, segments) -> None:
+        pending = []
+        try:
+            with wait_for_capacity():
+                # Whisper segments are grouped until they close a sentence
+                for _, _, text in segments:
+                    if self._cancelled.is_set():
+                        break
+                    pending.append(text.strip())
+                    if SENTENCE_END.search(pending[-1]):
+                        self._emit_sentence(" ".join(pending))
+                        pending = []
+            if pending and not self._cancelled.is_set():
+                self._emit_sentence(" ".join(pending))
+        except Exception as e:
+            self._fail("transcribe", e)
+        finally:
+            self._translate_queue.put(_END)
+
+    def _translate_worker(self) -> None:
+        try:
+            with wait_for_capacity():
+                while (item := self._translate_queue.get()) is not _END:
+                    if self._cancelled.is_set():
+                        continue
+                    sentence, text = item
+                    if self.source_lang != self.target_lang:
+                        text = clean_translation(run_stage("translate", translate, text, self.source_lang, self.target_lang))
+                    self._translations.append(text)
+                    self._events.put({"type": "translation", "sentence": sentence, "text": text})
+                    if text:
+                        self._synthesize_queue.put((sentence, text))
+        except Exception as e:
+            self._fail("translate", e)
+        finally:
+            self._synthesize_queue.put(_END)
+
+    def _synthesize_worker(self) -> None:
+        try:
+            with wait_for_capacity():
+                while (item := self._synthesize_queue.get()) is not _END:
+                    if self._cancelled.is_set():
+                        continue
+                    sentence, text = item
+                    info, chunks = synthesize_accent_stream(text, self.tts_lang, self.accent)
+                    audio = b"".join(stream_on_stage(synthesis_stage(info["model"]), chunks))
+                    self._events.put({
+                        "type": "audio", "sentence": sentence,
+                        "media_type": info["media_type"], "model": info["model"],
+                        "data": base64.b64encode(audio).decode("ascii")
+                    })
+        except Exception as e:
+            self._fail("synthesize", e)
+        finally:
+            # The synthesizer is the last stage to finish
+            self._events.put({
+                "type": "done",
+                "sentences": len(self._transcripts),
+                "transcription": " ".join(self._transcripts),
+                "translation": " ".join(self._translations)
+            })
+            self._events.put(_END)
@@ -0,0 +1,94 @@
+"""
+Sentence-level cache of synthesized speech.
+
+Entries are keyed by the normalized sentence, language, TTS backend, voice
+identity (a hash of the accent file, or "default") and the generation
+parameters, so the same sentence spoken by the same voice is generated
+once. Outputs are assembled from cached and freshly generated sentences.
+F5-TTS entries hold float32 samples, gTTS entries hold MP3 bytes (MP3
+frames can simply be concatenated). The store is a DiskLRUCache evicted by
+total bytes.
+"""
+
+import hashlib
+import os
+import struct
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+
+from pipeline.disk_cache import DiskLRUCache, hash_key
+
+# Set SYNTHESIS_CACHE_DIR="" to disable
+SYNTHESIS_CACHE_DIR = os.getenv("SYNTHESIS_CACHE_DIR", "cache/synthesis")
+SYNTHESIS_CACHE_MAX_BYTES = int(os.getenv("SYNTHESIS_CACHE_MAX_BYTES", str(1024**3)))
+DEFAULT_VOICE = "default"
+
+synthesis_cache = DiskLRUCache(SYNTHESIS_CACHE_DIR, SYNTHESIS_CACHE_MAX_BYTES)
+
+
+def normalize_sentence(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+@lru_cache(maxsize=256)
+def _file_hash(path: str, mtime_ns: int, size: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def voice_id(speaker_wav: str) -> str:
+    """Identity of a cloned voice (content hash of its accent file), or "default" """
+    if not speaker_wav:
+        return DEFAULT_VOICE
+    stat = os.stat(speaker_wav)
+    # Re-hashed only when the file changes
+    return _file_hash(speaker_wav, stat.st_mtime_ns, stat.st_size)
+
+
+def sentence_key(text: str, lang: str, backend: str, voice: str, params=()) -> str:
+    return hash_key(normalize_sentence(text), lang, backend, voice, repr(params))
+
+
+def encode_wave(wave: np.ndarray, sample_rate: int) -> bytes:
+    return struct.pack("<I", sample_rate) + np.asarray(wave, dtype="<f4").tobytes()
+
+
+def decode_wave(data: bytes) -> tuple:
+    (sample_rate,) = struct.unpack_from("<I", data)
+    return np.frombuffer(data, dtype="<f4", offset=4).astype(np.float32), sample_rate
+
+
+def cached_sentences(sentences: list, keys: list, generate, encode=lambda value: value, decode=lambda data: data) -> list:
+    """
+    Results for each sentence, generating only the ones not cached.
+
+    Args:
+        generate: Called once with the list of distinct uncached sentences;
+            returns their results in the same order
+        encode/decode: Convert a result to and from the bytes stored
+
+    Returns:
+        list: One result per sentence, in order
+    """
+    results = []
+    for key in keys:
+        data = synthesis_cache.get(key)
+        results.append(None if data is None else decode(data))
+
+    missing = {}
+    for key, sentence, result in zip(keys, sentences, results):
+        if result is None and key not in missing:
+            missing[key] = sentence
+    if missing:
+        fresh = dict(zip(missing, generate(list(missing.values()))))
+        for key, result in fresh.items():
+            synthesis_cache.put(key, encode(result))
+        results = [fresh[key] if result is None else result for key, result in zip(keys, results)]
+
+    print(f"🗂️ Synthesis: {len(sentences)} sentence(s), {len(sentences) - len(missing)} from cache")
+    return results
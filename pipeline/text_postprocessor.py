@@ -1,4 +1,17 @@
 # pipeline/text_postprocessor.py
+import re
+
+# Whitespace after sentence-final punctuation (Latin, Devanagari danda, CJK)
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?।॥。！？])\s+')
+# Text that closes a sentence, allowing trailing quotes and brackets
+SENTENCE_END = re.compile(r'[.!?।॥。！？]["\')\]]*$')
+
+
+def split_sentences(text):
+    """
+    Split text into sentences at SENTENCE_BOUNDARY, dropping empty pieces
+    """
+    return [sentence for sentence in SENTENCE_BOUNDARY.split(text.strip()) if sentence]
 
 def clean_transcription(text):
     """
@@ -1,8 +1,18 @@
-import subprocess
+import io
 import os
+import time
+import numpy as np
 import speech_recognition as sr
 # import torch
 from faster_whisper import WhisperModel
+from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+try:
+    from faster_whisper import BatchedInferencePipeline
+except ImportError:  # faster-whisper < 1.1
+    BatchedInferencePipeline = None
+from pipeline.audio_io import WHISPER_SAMPLE_RATE, decode_audio, to_wav_bytes
+from pipeline.metrics import observe_stage, record_model_load, timed
 
 # Load model ONCE (GPU)
 # _model = WhisperModel(
@@ -11,11 +21,13 @@ from faster_whisper import WhisperModel
 #     compute_type="float16"  # best for RTX 4090
 # )
 
+_load_started = time.perf_counter()
 _model = WhisperModel(
     "medium",
     device="cpu",
     compute_type="int8"
 )
+record_model_load("whisper", time.perf_counter() - _load_started)
 # device = "cuda" if torch.cuda.is_available() else "cpu"
 # compute_type = "float16" if device == "cuda" else "int8"
 
@@ -25,13 +37,38 @@ _model = WhisperModel(
 #     compute_type=compute_type
 # )
 
-def transcribe_hindi(audio_path: str) -> str:
-    """Transcribe Hindi audio using Google Speech Recognition"""
+# "sequential" decodes the whole file segment by segment (previous behaviour).
+# "batched" runs voice activity detection first, drops non-speech, and decodes
+# the speech chunks WHISPER_BATCH_SIZE at a time.
+WHISPER_MODE = os.getenv("WHISPER_MODE", "sequential")
+WHISPER_BATCH_SIZE = int(os.getenv("WHISPER_BATCH_SIZE", "8"))
+WHISPER_VAD_PARAMETERS = {
+    "min_silence_duration_ms": int(os.getenv("WHISPER_VAD_MIN_SILENCE_MS", "500")),
+}
+
+# Seconds of speech used to identify the spoken language when source_lang is "auto"
+LANG_DETECT_SECONDS = float(os.getenv("LANG_DETECT_SECONDS", "8"))
+
+_batched_model = None
+if WHISPER_MODE == "batched":
+    if BatchedInferencePipeline is not None:
+        _batched_model = BatchedInferencePipeline(model=_model)
+    else:
+        print("⚠️ faster-whisper has no batched pipeline; using VAD-filtered sequential decoding")
+
+def transcribe_hindi(audio) -> str:
+    """
+    Transcribe Hindi audio using Google Speech Recognition
+
+    Args:
+        audio: Path to a WAV file, or a 16 kHz mono float32 array
+    """
     recognizer = sr.Recognizer()
+    source_audio = io.BytesIO(to_wav_bytes(audio)) if isinstance(audio, np.ndarray) else audio
     
     try:
         print("🎯 Using Google Speech Recognition for Hindi...")
-        with sr.AudioFile(audio_path) as source:
+        with sr.AudioFile(source_audio) as source, timed("google_asr", "hi", "google"):
             audio_data = recognizer.record(source)
             text = recognizer.recognize_google(audio_data, language='hi-IN')
             print(f"✅ Google Hindi Transcription: {text}")
@@ -44,39 +81,133 @@ def transcribe_hindi(audio_path: str) -> str:
         return ""
 
 
-def transcribe(audio_path: str, language: str = "en") -> str:
+def _as_array(audio) -> np.ndarray:
+    if isinstance(audio, np.ndarray):
+        return audio
+    if not os.path.exists(audio):
+        raise FileNotFoundError(f"Audio file not found: {audio}")
+    # Decode to 16kHz mono in-process instead of writing a converted WAV
+    return decode_audio(audio)
+
+
+def has_speech(audio: np.ndarray) -> bool:
+    """True if voice activity detection finds any speech in a 16 kHz mono array"""
+    return bool(get_speech_timestamps(audio, VadOptions()))
+
+
+def detect_language(audio, seconds: float = LANG_DETECT_SECONDS) -> tuple:
+    """
+    Identify the spoken language from the first few seconds of speech.
+
+    Leading silence is skipped with VAD so the clip actually contains
+    speech. Only Whisper's language-ID pass runs; nothing is decoded.
+
+    Args:
+        audio: Path to an audio file, or a 16 kHz mono float32 array
+        seconds: Amount of speech to use
+
+    Returns:
+        tuple: (whisper_language_code, probability)
     """
-    Transcribe audio using Faster-Whisper (GPU).
-    Keeps your ffmpeg preprocessing unchanged.
+    audio = _as_array(audio)
+    wanted = int(seconds * WHISPER_SAMPLE_RATE)
+
+    clip_parts, collected = [], 0
+    for chunk in get_speech_timestamps(audio, VadOptions()):
+        part = audio[chunk["start"]:min(chunk["end"], chunk["start"] + wanted - collected)]
+        clip_parts.append(part)
+        collected += len(part)
+        if collected >= wanted:
+            break
+    clip = np.concatenate(clip_parts) if clip_parts else audio[:wanted]
+
+    # transcribe() identifies the language eagerly and decodes lazily; the
+    # segments generator is never consumed, so no decoding happens
+    with timed("whisper_language_id", backend="whisper"):
+        _, info = _model.transcribe(clip, language=None)
+    print(f"🌐 Detected language: {info.language} ({info.language_probability:.2f})")
+    return info.language, info.language_probability
+
+
+def iter_segments(audio, language: str = "en"):
     """
+    Transcribe audio into timed segments using Faster-Whisper, lazily.
 
-    if not os.path.exists(audio_path):
-        raise FileNotFoundError(f"Audio file not found: {audio_path}")
+    Faster-Whisper decodes as the generator is consumed, so each segment is
+    available as soon as it is decoded. In batched mode silence is skipped
+    before decoding, but segment times still refer to positions in the
+    original audio.
 
-    safe_wav_path = os.path.splitext(audio_path)[0] + "_converted.wav"
+    Args:
+        audio: Path to an audio file, or a 16 kHz mono float32 array that has
+            already been decoded (see pipeline.audio_io.decode_audio)
+        language: Whisper language code
 
-    # Convert to 16kHz mono WAV
-    subprocess.run([
-        "ffmpeg", "-y",
-        "-i", audio_path,
-        "-ar", "16000",
-        "-ac", "1",
-        "-c:a", "pcm_s16le",
-        safe_wav_path
-    ], check=True)
+    Yields:
+        tuple: (start_seconds, end_seconds, text)
+    """
+
+    audio = _as_array(audio)
+    started = time.perf_counter()
 
     # Faster-Whisper transcription
-    segments, info = _model.transcribe(
-        safe_wav_path,
-        language=language
-    )
+    if _batched_model is not None:
+        segments, info = _batched_model.transcribe(
+            audio,
+            language=language,
+            batch_size=WHISPER_BATCH_SIZE,
+            vad_filter=True,
+            vad_parameters=WHISPER_VAD_PARAMETERS
+        )
+    elif WHISPER_MODE == "batched":
+        segments, info = _model.transcribe(
+            audio,
+            language=language,
+            vad_filter=True,
+            vad_parameters=WHISPER_VAD_PARAMETERS
+        )
+    else:
+        segments, info = _model.transcribe(
+            audio,
+            language=language
+        )
 
-    text = " ".join(segment.text for segment in segments)
+    return _timed_segments(segments, time.perf_counter() - started, language)
 
-    try:
-        os.remove(safe_wav_path)
-    except Exception:
-        pass
+
+def _timed_segments(segments, elapsed: float, language: str):
+    """Yield segments, recording only the time spent decoding them"""
+    segments = iter(segments)
+    while True:
+        started = time.perf_counter()
+        segment = next(segments, None)
+        elapsed += time.perf_counter() - started
+        if segment is None:
+            break
+        yield segment.start, segment.end, segment.text
+    observe_stage("whisper", elapsed, language or "", WHISPER_MODE)
+
+
+def transcribe_segments(audio, language: str = "en") -> list:
+    """
+    Transcribe audio into timed segments using Faster-Whisper.
+
+    Returns:
+        list: (start_seconds, end_seconds, text) tuples
+    """
+    return list(iter_segments(audio, language=language))
+
+
+def transcribe(audio, language: str = "en") -> str:
+    """
+    Transcribe audio using Faster-Whisper.
+
+    Args:
+        audio: Path to an audio file, or a 16 kHz mono float32 array
+        language: Whisper language code
+    """
+    segments = transcribe_segments(audio, language=language)
+    text = " ".join(segment_text for _, _, segment_text in segments)
 
     print("✅ Transcription completed:", language, text)
     return text
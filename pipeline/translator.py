@@ -1,18 +1,326 @@
+import os
+import queue
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from concurrent.futures import Future
+
+import torch
+import transformers
 from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+from pipeline.kv_cache import TwoTierCache
+from pipeline.text_postprocessor import split_sentences
+from pipeline.metrics import language_pair, record_model_load, timed
 
 model_name = "facebook/nllb-200-distilled-600M"
+
+# CPU inference mode: "none" (fp32), "int8" (dynamic int8 Linear layers) or
+# "bf16" (only used when the CPU has native bf16 support)
+NLLB_QUANTIZE = os.getenv("NLLB_QUANTIZE", "none")
+NLLB_QUANTIZED_CACHE_DIR = os.getenv("NLLB_QUANTIZED_CACHE_DIR", "cache/nllb")
+
+
+def cpu_supports_bf16() -> bool:
+    """True if the CPU advertises native bf16 instructions (AVX512-BF16 or AMX)"""
+    try:
+        with open("/proc/cpuinfo") as f:
+            flags = f.read()
+    except OSError:
+        return False
+    return "avx512_bf16" in flags or "amx_bf16" in flags
+
+
+def _quantized_cache_path(mode: str) -> str:
+    # Pickled modules are tied to the library versions that produced them
+    versions = f"torch{torch.__version__}-transformers{transformers.__version__}"
+    return os.path.join(NLLB_QUANTIZED_CACHE_DIR, f"{model_name.replace('/', '--')}-{mode}-{versions}")
+
+
+def nllb_inference_mode(mode: str) -> str:
+    """The mode load_nllb_model() actually uses for a requested NLLB_QUANTIZE mode"""
+    if mode == "bf16" and not cpu_supports_bf16():
+        print("⚠️ CPU has no native bf16 support, using fp32 NLLB")
+        return "none"
+    return mode
+
+
+def load_nllb_model(mode: str = NLLB_QUANTIZE):
+    """
+    Load the NLLB model in the requested CPU inference mode.
+
+    The int8 and bf16 variants are built from the fp32 checkpoint once and
+    saved under NLLB_QUANTIZED_CACHE_DIR, so later starts load them directly.
+    """
+    mode = nllb_inference_mode(mode)
+    if mode == "int8":
+        cache_path = _quantized_cache_path(mode) + ".pt"
+        if os.path.exists(cache_path):
+            print(f"📦 Loading cached int8 NLLB from {cache_path}")
+            model = torch.load(cache_path, weights_only=False)
+        else:
+            print("🔧 Building int8 NLLB (one-time)...")
+            model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            os.makedirs(NLLB_QUANTIZED_CACHE_DIR, exist_ok=True)
+            torch.save(model, cache_path)
+    elif mode == "bf16":
+        cache_path = _quantized_cache_path(mode)
+        if os.path.isdir(cache_path):
+            print(f"📦 Loading cached bf16 NLLB from {cache_path}")
+            model = AutoModelForSeq2SeqLM.from_pretrained(cache_path, torch_dtype=torch.bfloat16)
+        else:
+            print("🔧 Building bf16 NLLB (one-time)...")
+            model = AutoModelForSeq2SeqLM.from_pretrained(model_name, torch_dtype=torch.bfloat16)
+            model.save_pretrained(cache_path)
+    else:
+        model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+
+    return model.eval()
+
+
+_load_started = time.perf_counter()
 tokenizer = AutoTokenizer.from_pretrained(model_name)
-model_nllb = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+NLLB_MODE = nllb_inference_mode(NLLB_QUANTIZE)
+model_nllb = load_nllb_model(NLLB_MODE)
+record_model_load("nllb", time.perf_counter() - _load_started)
+
+# Requests arriving within NLLB_MAX_WAIT_MS of each other share one generate call
+NLLB_MAX_BATCH = int(os.getenv("NLLB_MAX_BATCH", "8"))
+NLLB_MAX_WAIT_MS = float(os.getenv("NLLB_MAX_WAIT_MS", "10"))
+# Longest piece (in tokens) translated as one sequence, and padded tokens per generate call
+NLLB_MAX_CHUNK_TOKENS = int(os.getenv("NLLB_MAX_CHUNK_TOKENS", "200"))
+NLLB_MAX_BATCH_TOKENS = int(os.getenv("NLLB_MAX_BATCH_TOKENS", "2048"))
+
+# Output budget relative to input length; NLLB's default max_length of 200
+# tokens would otherwise silently cut off long outputs
+OUTPUT_TOKENS_PER_INPUT_TOKEN = 2
+OUTPUT_TOKENS_MARGIN = 16
+NLLB_MAX_POSITIONS = 1024
+
+# Sentence-level translation cache; set TRANSLATION_CACHE_PATH="" to keep it in memory only
+TRANSLATION_CACHE_PATH = os.getenv("TRANSLATION_CACHE_PATH", "cache/translations.sqlite3")
+TRANSLATION_CACHE_ITEMS = int(os.getenv("TRANSLATION_CACHE_ITEMS", "10000"))
+
+# Scripts written without spaces between sentences
+UNSPACED_SCRIPTS = ("Jpan", "Hans", "Hant", "Thai")
+
+# The tokenizer's src_lang is shared state; guard every use of it
+_tokenizer_lock = threading.Lock()
+
+
+def _generate(input_ids: list, target_lang: str) -> list:
+    """Run one padded generate call over already tokenized inputs"""
+    with _tokenizer_lock:
+        inputs = tokenizer.pad({"input_ids": input_ids}, return_tensors="pt")
+    longest = inputs["input_ids"].shape[1]
+    max_new_tokens = min(longest * OUTPUT_TOKENS_PER_INPUT_TOKEN + OUTPUT_TOKENS_MARGIN, NLLB_MAX_POSITIONS)
+
+    with torch.inference_mode():
+        translated_tokens = model_nllb.generate(
+            **inputs,
+            forced_bos_token_id=tokenizer.lang_code_to_id[target_lang],  # ✅ Target language
+            max_new_tokens=max_new_tokens
+        )
+
+    return tokenizer.batch_decode(translated_tokens, skip_special_tokens=True)
+
+
+def _encode(texts: list, source_lang: str) -> list:
+    with _tokenizer_lock:
+        tokenizer.src_lang = source_lang  # ✅ Set source language
+        return tokenizer(texts)["input_ids"]
+
+
+def _count_tokens(text: str) -> int:
+    with _tokenizer_lock:
+        return len(tokenizer(text, add_special_tokens=False)["input_ids"])
+
+
+def split_for_translation(text: str, max_tokens: int = NLLB_MAX_CHUNK_TOKENS) -> list:
+    """
+    Split text into sentence-sized pieces of at most `max_tokens` tokens.
+
+    NLLB is trained on single sentences and decoding cost grows with the
+    square of sequence length, so long transcripts are translated sentence
+    by sentence. Sentences that are still too long are split at word
+    boundaries; no text is dropped.
+    """
+    pieces = []
+    for sentence in split_sentences(text):
+        if _count_tokens(sentence) <= max_tokens:
+            pieces.append(sentence)
+            continue
+
+        current, current_tokens = [], 0
+        for word in sentence.split():
+            word_tokens = _count_tokens(word)
+            if current and current_tokens + word_tokens > max_tokens:
+                pieces.append(" ".join(current))
+                current, current_tokens = [], 0
+            current.append(word)
+            current_tokens += word_tokens
+        if current:
+            pieces.append(" ".join(current))
+    return pieces
+
+
+def join_translations(pieces: list, target_lang: str) -> str:
+    separator = "" if target_lang.endswith(UNSPACED_SCRIPTS) else " "
+    return separator.join(piece.strip() for piece in pieces)
+
+
+class BatchingTranslator:
+    """
+    Micro-batching front end for the NLLB model.
+
+    Callers submit single texts from any thread. A worker thread collects
+    requests for up to `max_wait_ms` (or until `max_batch` are waiting),
+    groups them by (source, target) language pair, runs one generate per
+    group and hands each caller its own result. Within a group, inputs are
+    sorted by length and packed so each generate call stays within
+    `max_batch_tokens` padded tokens.
+    """
+
+    def __init__(self, max_batch: int = NLLB_MAX_BATCH, max_wait_ms: float = NLLB_MAX_WAIT_MS,
+                 max_batch_tokens: int = NLLB_MAX_BATCH_TOKENS):
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch_tokens = max_batch_tokens
+        self._requests = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def submit(self, text: str, source_lang: str, target_lang: str) -> Future:
+        self._ensure_worker()
+        future = Future()
+        self._requests.put((text, source_lang, target_lang, future))
+        return future
+
+    def translate_many(self, texts: list, source_lang: str, target_lang: str) -> list:
+        """Submit several texts together and wait for all of them, in order"""
+        futures = [self.submit(text, source_lang, target_lang) for text in texts]
+        return [future.result() for future in futures]
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="nllb-batcher", daemon=True)
+                    self._worker.start()
+
+    def _collect(self):
+        pending = [self._requests.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(pending) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                pending.append(self._requests.get(timeout=remaining))
+            except queue.Empty:
+                break
+        # Whatever else is already waiting joins this round without extra delay
+        while True:
+            try:
+                pending.append(self._requests.get_nowait())
+            except queue.Empty:
+                return pending
+
+    def _pack(self, lengths: list) -> list:
+        """Group indices (shortest first) into batches bounded by count and padded size"""
+        batches, batch = [], []
+        for i in sorted(range(len(lengths)), key=lengths.__getitem__):
+            # Sorted order means the newest item is always the longest in its batch
+            padded = (len(batch) + 1) * lengths[i]
+            if batch and (len(batch) >= self.max_batch or padded > self.max_batch_tokens):
+                batches.append(batch)
+                batch = []
+            batch.append(i)
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _run(self):
+        while True:
+            pending = self._collect()
+            try:
+                self._translate_round(pending)
+            except Exception as e:
+                # The worker must survive: callers block on these futures
+                print(f"❌ NLLB batcher failed a round: {e}")
+                for *_, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _translate_round(self, pending):
+        groups = defaultdict(list)
+        for text, source_lang, target_lang, future in pending:
+            if future.set_running_or_notify_cancel():
+                groups[(source_lang, target_lang)].append((text, future))
+
+        for (source_lang, target_lang), items in groups.items():
+            try:
+                input_ids = _encode([text for text, _ in items], source_lang)
+            except Exception as e:
+                for _, future in items:
+                    future.set_exception(e)
+                continue
+
+            for batch in self._pack([len(ids) for ids in input_ids]):
+                try:
+                    with timed("nllb", language_pair(source_lang, target_lang), f"nllb-{NLLB_MODE}"):
+                        results = _generate([input_ids[i] for i in batch], target_lang)
+                except Exception as e:
+                    for i in batch:
+                        items[i][1].set_exception(e)
+                else:
+                    for i, result in zip(batch, results):
+                        items[i][1].set_result(result)
+
+
+_batcher = BatchingTranslator()
+translation_cache = TwoTierCache(TRANSLATION_CACHE_PATH, "translations", TRANSLATION_CACHE_ITEMS)
+
+
+def normalize_for_cache(text: str) -> str:
+    """Unicode-normalize and collapse whitespace so trivially different inputs share a key"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def translation_cache_key(text: str, source_lang: str, target_lang: str) -> str:
+    # Outputs differ between checkpoints and between fp32/int8/bf16 inference
+    return f"{model_name}\x1f{NLLB_MODE}\x1f{source_lang}\x1f{target_lang}\x1f{normalize_for_cache(text)}"
+
 
 def translate(text: str, source_lang: str, target_lang: str) -> str:
-    tokenizer.src_lang = source_lang  # ✅ Set source language
+    """
+    Translate text of any length.
+
+    The text is split into sentence-sized pieces. Pieces already in the
+    translation cache are reused; the rest are translated as a batch, stored,
+    and everything is joined back in the original order.
+    """
+    pieces = split_for_translation(text)
+    if not pieces:
+        return ""
+
+    keys = [translation_cache_key(piece, source_lang, target_lang) for piece in pieces]
+    results = [translation_cache.get(key) for key in keys]
 
-    inputs = tokenizer(text, return_tensors="pt")
+    # Each distinct uncached piece is translated once
+    missing = {}
+    for key, piece, result in zip(keys, pieces, results):
+        if result is None and key not in missing:
+            missing[key] = piece
+    if missing:
+        fresh = _batcher.translate_many(list(missing.values()), source_lang, target_lang)
+        fresh_by_key = dict(zip(missing, fresh))
+        for key, result in fresh_by_key.items():
+            translation_cache.put(key, result)
+        results = [fresh_by_key.get(key, result) if result is None else result for key, result in zip(keys, results)]
 
-    translated_tokens = model_nllb.generate(
-        **inputs,
-        forced_bos_token_id=tokenizer.lang_code_to_id[target_lang]  # ✅ Target language
-    )
+    translated = join_translations(results, target_lang)
 
-    print("Step 2: Translation completed")
-    return tokenizer.batch_decode(translated_tokens, skip_special_tokens=True)[0]
+    print(f"Step 2: Translation completed ({len(pieces)} piece(s), {len(pieces) - len(missing)} from cache)")
+    return translated
@@ -4,13 +4,19 @@ import sys
 from indic_transliteration import sanscript
 from indic_transliteration.sanscript import transliterate
 import re
+import struct
+import numpy as np
 from dotenv import load_dotenv
-# import google.generativeai as genai
-import google.genai as genai
+from pipeline.metrics import timed
+from pipeline.text_postprocessor import split_sentences
 
 load_dotenv()
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
-GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+
+# These read their settings (HINDI_ROMANIZER, GEMINI_API_KEY, cache paths)
+# from the environment at import, so they must come after load_dotenv()
+from pipeline.romanizer import romanize_hindi  # noqa: E402
+from pipeline.synthesis_cache import DEFAULT_VOICE, cached_sentences, sentence_key, synthesis_cache  # noqa: E402
 
 
 # Add parent directory to path to import from main
@@ -18,7 +24,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Try to import F5-TTS
 try:
-    from pipeline.f5tts_synthesizer import synthesize_with_f5tts, F5TTS_AVAILABLE
+    from pipeline.f5tts_synthesizer import synthesize_with_f5tts, stream_with_f5tts, F5TTS_AVAILABLE, SENTENCE_PAUSE_MS
 except ImportError:
     F5TTS_AVAILABLE = False
     print("⚠️ F5-TTS not available. Install with: pip install f5-tts")
@@ -47,55 +53,142 @@ except ImportError:
 #     phonetic = epi.transliterate(text)
 #     print(f"🔤 Phonetic Hindi: '{text}' -> '{phonetic}'")
 #     return phonetic
-if GEMINI_API_KEY:
-    import google.genai as genai
-    client = genai.Client(api_key=GEMINI_API_KEY)
-else:
-    print("⚠️ GEMINI_API_KEY not found in environment variables")
-
-
 def hindi_to_simple_roman(text: str) -> str:
+    """Hindi (Devanagari) to simple Roman spelling for F5-TTS (see pipeline.romanizer)"""
     print(f"🔄 Hindi to Roman: Input = '{text}'")
-    
-    text = text.strip()
-    
-    if not any('\u0900' <= char <= '\u097F' for char in text):
-        return text.lower()
-    
-    # Try Gemini API first
-    if GEMINI_API_KEY:
-        try:
-            import google.genai as genai
-            client = genai.Client(api_key=GEMINI_API_KEY)
-            
-            prompt = f"""Convert this Hindi text to Romanized Hindi for TTS.
-            Use simple phonetic spelling. Output only romanized text.
-            
-            Hindi: "{text}"
-            Romanized: """
-            
-            response = client.models.generate_content(
-                model="gemini-2.0-flash",
-                contents=[{
-                    "role": "user", 
-                    "parts": [{"text": prompt}]
-                }]
-            )
-            
-            roman = response.text.strip()
-            roman = roman.strip('"\'')
-            print(f"✅ Gemini Romanized: '{text}' -> '{roman}'")
-            return roman.lower()
-            
-        except Exception as e:
-            print(f"❌ Gemini API failed: {e}")
-    
+    roman = romanize_hindi(text)
+    print(f"✅ Romanized: '{text}' -> '{roman}'")
+    return roman
+
+
+# Language mapping for gTTS
+GTTS_LANG_MAP = {
+    'en': 'en', 'hi': 'hi', 'fr': 'fr', 'es': 'es',
+    'de': 'de', 'ja': 'ja', 'ko': 'ko', 'zh': 'zh',
+    'ar': 'ar', 'it': 'it', 'pt': 'pt', 'ru': 'ru',
+}
+
+
+def wav_stream_header(sample_rate: int, channels: int = 1, bits_per_sample: int = 16) -> bytes:
+    """
+    WAV header for a stream whose length is not known yet.
+
+    The RIFF and data sizes are set to the maximum value, which players
+    treat as "read until the connection closes".
+    """
+    byte_rate = sample_rate * channels * bits_per_sample // 8
+    block_align = channels * bits_per_sample // 8
+    return (
+        b"RIFF" + struct.pack("<I", 0xFFFFFFFF) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, channels, sample_rate, byte_rate, block_align, bits_per_sample)
+        + b"data" + struct.pack("<I", 0xFFFFFFFF)
+    )
+
+
+def to_pcm16(wave) -> bytes:
+    """Convert a float waveform in [-1, 1] to little-endian 16-bit PCM bytes"""
+    return (np.clip(wave, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+def gtts_sentence(sentence: str, gtts_lang: str) -> bytes:
+    """MP3 for one sentence in the default voice"""
+    with timed("gtts", gtts_lang, "gtts"):
+        return b"".join(gTTS(text=sentence, lang=gtts_lang).stream())
+
 
+def gtts_sentences(text: str, gtts_lang: str) -> list:
+    """MP3 pieces for each sentence of text, reusing cached sentences"""
+    sentences = split_sentences(text) or [text]
+    keys = [sentence_key(sentence, gtts_lang, "gtts", DEFAULT_VOICE) for sentence in sentences]
+    return cached_sentences(sentences, keys, lambda pending: [gtts_sentence(sentence, gtts_lang) for sentence in pending])
 
 
-def synthesize(text: str, speaker_text: str, speaker_wav: str, output_path: str, lang: str, model: str = "f5tts"):
+def stream_gtts_sentences(text: str, gtts_lang: str):
+    """Yield MP3 bytes sentence by sentence, cached sentences immediately"""
+    for sentence in split_sentences(text) or [text]:
+        key = sentence_key(sentence, gtts_lang, "gtts", DEFAULT_VOICE)
+        mp3 = synthesis_cache.get(key)
+        if mp3 is None:
+            mp3 = gtts_sentence(sentence, gtts_lang)
+            synthesis_cache.put(key, mp3)
+        yield mp3
+
+
+def romanize_for_f5tts(text: str, lang: str) -> str:
+    """F5-TTS clones Hindi voices from Romanized text"""
+    if lang == 'hi' and any('\u0900' <= char <= '\u097F' for char in text):
+        phonetic_text = hindi_to_simple_roman(text)
+        print(f"🔤 Hindi to Romanized for F5-TTS: '{text}' -> '{phonetic_text}'")
+        return phonetic_text
+    return text
+
+
+def synthesis_stage(model: str) -> str:
+    """Stage executor a synthesis model runs on (see pipeline.executors)"""
+    return "synthesize" if model == "f5tts" else "gtts"
+
+
+def synthesize_stream(text: str, speaker_wav: str, lang: str, model: str = "f5tts",
+                      ref_audio_path: str = None, ref_text: str = None):
+    """
+    Synthesize speech incrementally for streaming responses.
+
+    Voice cloning (F5-TTS) streams 16-bit mono WAV, one sentence at a time.
+    The default voice (gTTS) streams MP3 one sentence at a time; sentences
+    synthesized before come from the cache (see stream_gtts_sentences).
+
+    Returns:
+        tuple: (info dict with model/voice/media_type, iterator of bytes)
+    """
+    if model == "f5tts" and F5TTS_AVAILABLE and speaker_wav:
+        print("🎤 Streaming F5-TTS VOICE CLONING")
+        f5_text = romanize_for_f5tts(text, lang)
+
+        def f5tts_chunks():
+            header_sent = False
+            for wave, sample_rate in stream_with_f5tts(f5_text, speaker_wav, lang, ref_audio_path, ref_text):
+                if not header_sent:
+                    yield wav_stream_header(sample_rate)
+                    header_sent = True
+                else:
+                    yield bytes(2 * int(sample_rate * SENTENCE_PAUSE_MS / 1000))
+                yield to_pcm16(wave)
+
+        info = {"model": "f5tts", "voice": "cloned", "media_type": "audio/wav"}
+        return info, f5tts_chunks()
+
+    print("🔊 Streaming DEFAULT SYSTEM VOICE (gTTS)")
+    gtts_lang = GTTS_LANG_MAP.get(lang, 'en')
+    # MP3 frames concatenate cleanly, so sentences stream back to back
+    info = {"model": "gTTS", "voice": "default", "media_type": "audio/mpeg"}
+    return info, stream_gtts_sentences(text, gtts_lang)
+
+
+def synthesize_accent_stream(text: str, lang: str, accent: dict = None):
+    """
+    synthesize_stream() in a saved accent's cloned voice (F5-TTS), or in the
+    default voice (gTTS) when accent is None.
+
+    Args:
+        accent: Saved accent dict with file_path, ref_audio_path and ref_text
+    """
+    return synthesize_stream(
+        text,
+        accent["file_path"] if accent else "",
+        lang,
+        "f5tts" if accent else "gtts",
+        ref_audio_path=accent["ref_audio_path"] if accent else None,
+        ref_text=accent["ref_text"] if accent else None
+    )
+
+
+def synthesize(text: str, speaker_text: str, speaker_wav: str, output_path: str, lang: str, model: str = "f5tts",
+               ref_audio_path: str = None, ref_text: str = None):
     """
     Synthesize speech using F5-TTS with gTTS fallback.
+
+    ref_audio_path/ref_text are the trimmed reference clip and transcript
+    stored with a saved accent; when given, F5-TTS skips re-transcribing it.
     """
     print(f"🎯 TTS INPUT DEBUG: text='{text}', lang='{lang}', speaker_wav='{speaker_wav}'")
     
@@ -104,9 +197,7 @@ def synthesize(text: str, speaker_text: str, speaker_wav: str, output_path: str,
     
     # 🚨 ONLY convert Hindi text to Romanized for F5-TTS voice cloning
     if model == "f5tts" and speaker_wav and lang == 'hi' and any('\u0900' <= char <= '\u097F' for char in text):
-        phonetic_text = hindi_to_simple_roman(text)
-        print(f"🔤 Hindi to Romanized for F5-TTS: '{text}' -> '{phonetic_text}'")
-        text = phonetic_text
+        text = romanize_for_f5tts(text, lang)
         # Also update speaker_text if it's the same
         if speaker_text and any('\u0900' <= char <= '\u097F' for char in speaker_text):
             speaker_text = hindi_to_simple_roman(speaker_text)
@@ -121,19 +212,13 @@ def synthesize(text: str, speaker_text: str, speaker_wav: str, output_path: str,
             # Create directory if it doesn't exist
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
             
-            # Language mapping for gTTS
-            lang_map = {
-                'en': 'en', 'hi': 'hi', 'fr': 'fr', 'es': 'es', 
-                'de': 'de', 'ja': 'ja', 'ko': 'ko', 'zh': 'zh',
-                'ar': 'ar', 'it': 'it', 'pt': 'pt', 'ru': 'ru',
-            }
-            
-            gtts_lang = lang_map.get(lang, 'en')
+            gtts_lang = GTTS_LANG_MAP.get(lang, 'en')
             print(f"🌐 Using gTTS language: {gtts_lang}")
             
-            # Generate TTS with default voice USING ORIGINAL HINDI TEXT
-            tts = gTTS(text=original_text, lang=gtts_lang)
-            tts.save(output_path)
+            # Generate TTS with default voice USING ORIGINAL HINDI TEXT,
+            # per sentence so repeated sentences come from the cache
+            with open(output_path, "wb") as f:
+                f.write(b"".join(gtts_sentences(original_text, gtts_lang)))
             
             # Verify file was created
             if os.path.exists(output_path):
@@ -155,7 +240,8 @@ def synthesize(text: str, speaker_text: str, speaker_wav: str, output_path: str,
         print(f"   Language: {lang}")
         print(f"   Speaker audio: {speaker_wav}")
         
-        success = synthesize_with_f5tts(text, speaker_wav, output_path, lang)
+        success = synthesize_with_f5tts(text, speaker_wav, output_path, lang,
+                                        ref_audio_path=ref_audio_path, ref_text=ref_text)
         if success:
             print(f"✅ F5-TTS voice cloning successful")
             return {"model": "f5tts", "success": True, "voice": "cloned"}
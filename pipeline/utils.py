@@ -1,4 +1,117 @@
+import numpy as np
 from pydub import AudioSegment, silence
+from pydub.utils import db_to_float
+
+# pydub sample width (bytes) -> NumPy dtype of its raw data (24-bit has none)
+SAMPLE_DTYPES = {1: np.int8, 2: np.int16, 4: np.int32}
+
+
+def _frame_counts(ms, frame_rate: int) -> np.ndarray:
+    # Same float arithmetic as AudioSegment.frame_count(ms=...) used by slicing
+    return (np.asarray(ms, dtype=np.float64) * (frame_rate / 1000.0)).astype(np.int64)
+
+
+def detect_silence_ranges(audio: AudioSegment, min_silence_len: int = 1000, silence_thresh: float = -16,
+                          seek_step: int = 1) -> list:
+    """
+    NumPy version of pydub.silence.detect_silence with identical results.
+
+    pydub measures the RMS of a min_silence_len window starting at every
+    seek_step milliseconds; here all window energies come from one cumulative
+    sum of squared samples.
+
+    Returns:
+        list: [start_ms, end_ms] silent ranges
+    """
+    seg_len = len(audio)
+    if seg_len < min_silence_len:
+        return []
+
+    frames = np.frombuffer(audio.raw_data, dtype=SAMPLE_DTYPES[audio.sample_width]).reshape(-1, audio.channels)
+    threshold = db_to_float(silence_thresh) * audio.max_possible_amplitude
+
+    last_slice_start = seg_len - min_silence_len
+    slice_starts = np.arange(0, last_slice_start + 1, seek_step)
+    if last_slice_start % seek_step:
+        slice_starts = np.append(slice_starts, last_slice_start)
+
+    # int64 is exact for 8/16-bit audio; audioop sums in double precision
+    acc_dtype = np.float64 if audio.sample_width == 4 else np.int64
+    energy = np.zeros(len(frames) + 1, dtype=acc_dtype)
+    np.cumsum(np.square(frames, dtype=acc_dtype).sum(axis=1), out=energy[1:])
+
+    starts = _frame_counts(slice_starts, audio.frame_rate)
+    ends = _frame_counts(slice_starts + min_silence_len, audio.frame_rate)
+    # Windows that run past the data are zero-padded by pydub, so the sum is
+    # clipped but the sample count is not
+    sums = energy[np.minimum(ends, len(frames))] - energy[np.minimum(starts, len(frames))]
+    counts = (ends - starts) * audio.channels
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rms = np.where(counts > 0, np.floor(np.sqrt(sums / np.maximum(counts, 1))), 0)
+
+    silence_starts = slice_starts[rms <= threshold]
+    if not len(silence_starts):
+        return []
+
+    # A new range begins where consecutive silent windows neither touch nor overlap
+    steps = np.diff(silence_starts)
+    breaks = np.nonzero((steps != seek_step) & (steps > min_silence_len))[0] + 1
+    range_starts = silence_starts[np.concatenate(([0], breaks))]
+    range_ends = silence_starts[np.concatenate((breaks - 1, [len(silence_starts) - 1]))] + min_silence_len
+    return [[int(start), int(end)] for start, end in zip(range_starts, range_ends)]
+
+
+def split_ranges_on_silence(audio: AudioSegment, min_silence_len: int = 1000, silence_thresh: float = -16,
+                            keep_silence: int = 100, seek_step: int = 1) -> list:
+    """
+    Millisecond ranges that pydub.silence.split_on_silence would cut out.
+
+    Returns:
+        list: [start_ms, end_ms] ranges of non-silent audio, padded with
+        keep_silence ms and clipped to the segment
+    """
+    seg_len = len(audio)
+    if isinstance(keep_silence, bool):
+        keep_silence = seg_len if keep_silence else 0
+
+    silent_ranges = detect_silence_ranges(audio, min_silence_len, silence_thresh, seek_step)
+    if not silent_ranges:
+        nonsilent = [[0, seg_len]]
+    elif silent_ranges[0] == [0, seg_len]:
+        nonsilent = []
+    else:
+        nonsilent, prev_end = [], 0
+        for start, end in silent_ranges:
+            nonsilent.append([prev_end, start])
+            prev_end = end
+        if prev_end != seg_len:
+            nonsilent.append([prev_end, seg_len])
+        if nonsilent[0] == [0, 0]:
+            nonsilent.pop(0)
+
+    ranges = [[start - keep_silence, end + keep_silence] for start, end in nonsilent]
+    # Overlapping padding is split at the midpoint
+    for current, following in zip(ranges, ranges[1:]):
+        if following[0] < current[1]:
+            current[1] = (current[1] + following[0]) // 2
+            following[0] = current[1]
+
+    return [[max(start, 0), min(end, seg_len)] for start, end in ranges]
+
+
+def join_ranges(audio: AudioSegment, ranges: list) -> AudioSegment:
+    """Concatenate millisecond ranges of audio with a single gather"""
+    frames = np.frombuffer(audio.raw_data, dtype=SAMPLE_DTYPES[audio.sample_width]).reshape(-1, audio.channels)
+    bounds = _frame_counts(ranges, audio.frame_rate).reshape(-1, 2)
+
+    overrun = int(bounds[:, 1].max(initial=0)) - len(frames)
+    if overrun > 0:
+        # pydub pads slices that end a rounding error past the data with silence
+        frames = np.concatenate((frames, np.zeros((overrun, audio.channels), dtype=frames.dtype)))
+
+    index = np.concatenate([np.arange(start, end) for start, end in bounds] or [np.zeros(0, dtype=np.int64)])
+    return audio._spawn(frames[index].tobytes())
+
 
 def clip_audio(input_path: str, output_path: str, start_sec: int = 0, clip_duration_sec: int = 15):
 
@@ -9,17 +122,30 @@ def clip_audio(input_path: str, output_path: str, start_sec: int = 0, clip_durat
         raise ValueError(f"Failed to read audio: {e}")
 
     # Step 1: Remove silence
-    non_silent_chunks = silence.split_on_silence(
-        audio,
-        min_silence_len=500,  # silence longer than 500ms
-        silence_thresh=audio.dBFS - 16,  # silence threshold
-        keep_silence=100  # keep 100ms of silence at edges
-    )
+    if audio.sample_width in SAMPLE_DTYPES:
+        non_silent_ranges = split_ranges_on_silence(
+            audio,
+            min_silence_len=500,  # silence longer than 500ms
+            silence_thresh=audio.dBFS - 16,  # silence threshold
+            keep_silence=100  # keep 100ms of silence at edges
+        )
+
+        if not non_silent_ranges:
+            raise ValueError("No non-silent parts detected")
+
+        processed_audio = join_ranges(audio, non_silent_ranges)
+    else:
+        non_silent_chunks = silence.split_on_silence(
+            audio,
+            min_silence_len=500,
+            silence_thresh=audio.dBFS - 16,
+            keep_silence=100
+        )
 
-    if not non_silent_chunks:
-        raise ValueError("No non-silent parts detected")
+        if not non_silent_chunks:
+            raise ValueError("No non-silent parts detected")
 
-    processed_audio = sum(non_silent_chunks)
+        processed_audio = sum(non_silent_chunks)
 
     # Step 2: Clip audio
     start_ms = start_sec * 1000
@@ -0,0 +1,46 @@
+"""
+Block-wise audio enhancement against the whole-signal version.
+
+Run with: python -m pytest test_audio_enhancer.py
+"""
+import numpy as np
+import pytest
+
+pytest.importorskip("librosa")
+pytest.importorskip("noisereduce")
+sf = pytest.importorskip("soundfile")
+
+from pipeline.audio_enhancer import NOISE_CHUNK_SIZE, enhance_audio, enhance_audio_streaming  # noqa: E402
+
+SAMPLE_RATE = 16000
+
+
+def write_noisy_speech(path, frames):
+    rng = np.random.default_rng(0)
+    t = np.arange(frames) / SAMPLE_RATE
+    # Tones switching on and off like syllables, over background noise
+    envelope = (np.sin(2 * np.pi * 3 * t) > 0).astype(np.float32)
+    voice = 0.4 * envelope * (np.sin(2 * np.pi * 220 * t) + 0.5 * np.sin(2 * np.pi * 1100 * t))
+    noise = 0.05 * rng.standard_normal(frames)
+    sf.write(path, (voice + noise).astype(np.float32), SAMPLE_RATE, subtype="FLOAT")
+
+
+@pytest.mark.parametrize("frames", [
+    3 * SAMPLE_RATE,
+    # Two full noise-reduction chunks and a short, zero-padded last one
+    2 * NOISE_CHUNK_SIZE + 40000,
+], ids=["single-chunk", "multi-chunk"])
+def test_streaming_matches_whole_signal(tmp_path, frames):
+    source = str(tmp_path / "input.wav")
+    write_noisy_speech(source, frames)
+
+    whole = enhance_audio(source, str(tmp_path / "whole" / "out.wav"), target_sr=SAMPLE_RATE)
+    streamed = enhance_audio_streaming(source, str(tmp_path / "streamed" / "out.wav"), target_sr=SAMPLE_RATE)
+    assert whole != source and streamed != source
+
+    expected, expected_sr = sf.read(whole)
+    actual, actual_sr = sf.read(streamed)
+    assert actual_sr == expected_sr == SAMPLE_RATE
+    assert len(actual) == len(expected) == frames
+    # Both are written as 16-bit PCM; allow for rounding to a neighbouring step
+    np.testing.assert_allclose(actual, expected, rtol=0, atol=2 / 32768)
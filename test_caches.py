@@ -0,0 +1,139 @@
+"""
+Denoise and synthesis caches: hits, misses and byte-bounded LRU eviction.
+
+Run with: python -m pytest test_caches.py
+"""
+import os
+
+import pytest
+
+pytest.importorskip("numpy")
+
+# Caches under test are created in tmp_path; keep the module-level ones off disk
+os.environ["SYNTHESIS_CACHE_DIR"] = ""
+os.environ["DENOISE_CACHE_DIR"] = ""
+
+from pipeline import synthesis_cache as synthesis  # noqa: E402
+from pipeline.disk_cache import DiskLRUCache  # noqa: E402
+
+
+def age(cache, key, seconds_ago):
+    """Backdate an entry's last use"""
+    path = cache.path_for(key)
+    when = os.path.getmtime(path) - seconds_ago
+    os.utime(path, (when, when))
+
+
+def test_hits_and_misses(tmp_path):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=1024)
+    assert cache.get("a") is None
+    cache.put("a", b"12345")
+    assert cache.get("a") == b"12345"
+    assert cache.get("b") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["bytes"]) == (1, 2, 5)
+    assert stats["hit_ratio"] == pytest.approx(1 / 3)
+
+
+def test_evicts_least_recently_used_beyond_max_bytes(tmp_path):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=30, suffix=".bin")
+    for i, key in enumerate(("a", "b", "c")):
+        cache.put(key, bytes(10))
+        age(cache, key, 300 - 100 * i)
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a") is not None
+
+    cache.put("d", bytes(15))
+
+    assert cache.get("b") is None and cache.get("c") is None
+    assert cache.get("a") is not None and cache.get("d") is not None
+    assert cache.stats()["bytes"] == 25
+    assert sorted(os.listdir(tmp_path)) == ["a.bin", "d.bin"]
+
+
+def test_overwrite_counts_the_new_size_only(tmp_path):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=100)
+    for size in (40, 10, 25):
+        cache.put("a", bytes(size))
+    assert cache.stats()["bytes"] == 25
+    # A restarted process sees the same total
+    assert DiskLRUCache(str(tmp_path), max_bytes=100).stats()["bytes"] == 25
+
+
+def test_disabled_cache_stores_nothing():
+    cache = DiskLRUCache("", max_bytes=100)
+    cache.put("a", b"data")
+    assert not cache.enabled and cache.get("a") is None
+
+
+@pytest.fixture
+def sentence_cache(tmp_path, monkeypatch):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=1 << 20)
+    monkeypatch.setattr(synthesis, "synthesis_cache", cache)
+    return cache
+
+
+def test_only_uncached_sentences_are_synthesized(sentence_cache):
+    generated = []
+
+    def generate(pending):
+        generated.append(list(pending))
+        return [sentence.upper().encode() for sentence in pending]
+
+    def synthesize(sentences):
+        keys = [synthesis.sentence_key(s, "en", "gtts", synthesis.DEFAULT_VOICE) for s in sentences]
+        return synthesis.cached_sentences(sentences, keys, generate)
+
+    assert synthesize(["One.", "Two.", "One."]) == [b"ONE.", b"TWO.", b"ONE."]
+    # Repeated and whitespace-variant sentences share an entry
+    assert synthesize(["Two.", " One. ", "Three."]) == [b"TWO.", b"ONE.", b"THREE."]
+    assert generated == [["One.", "Two."], ["Three."]]
+    assert sentence_cache.stats()["hits"] == 2
+
+
+def test_sentence_keys_separate_voices_languages_and_settings():
+    key = synthesis.sentence_key("Hello there.", "en", "f5tts", "voice-a", ("F5-TTS", 32))
+    assert key == synthesis.sentence_key("Hello  there.", "en", "f5tts", "voice-a", ("F5-TTS", 32))
+    assert key != synthesis.sentence_key("Hello there.", "fr", "f5tts", "voice-a", ("F5-TTS", 32))
+    assert key != synthesis.sentence_key("Hello there.", "en", "f5tts", "voice-b", ("F5-TTS", 32))
+    assert key != synthesis.sentence_key("Hello there.", "en", "f5tts", "voice-a", ("F5-TTS", 16))
+
+
+def test_waves_round_trip_through_the_cache_encoding():
+    import numpy as np
+
+    wave = np.linspace(-1, 1, 101, dtype=np.float32)
+    decoded, sample_rate = synthesis.decode_wave(synthesis.encode_wave(wave, 24000))
+    assert sample_rate == 24000
+    np.testing.assert_array_equal(decoded, wave)
+
+
+def test_denoised_audio_is_reused(tmp_path, monkeypatch):
+    pytest.importorskip("torch")
+    pytest.importorskip("resemble_enhance")
+    import numpy as np
+
+    from pipeline import resemble_enhance_denoiser as denoiser
+    from pipeline.audio_buffer import AudioBuffer
+
+    calls = []
+
+    def fake_denoise(wav, sample_rate, device="cpu"):
+        calls.append(len(wav))
+        return wav * 0.5, sample_rate
+
+    monkeypatch.setattr(denoiser, "denoise", fake_denoise)
+    monkeypatch.setattr(denoiser, "denoise_cache", DiskLRUCache(str(tmp_path), 1 << 20, suffix=".wav"))
+
+    upload = AudioBuffer(np.sin(np.linspace(0, 100, denoiser.DENOISE_SAMPLE_RATE)).astype(np.float32), denoiser.DENOISE_SAMPLE_RATE)
+    first = denoiser.denoise_buffer(upload)
+    second = denoiser.denoise_buffer(AudioBuffer(upload.samples.copy(), upload.rate))
+
+    assert len(calls) == 1
+    np.testing.assert_allclose(second.samples, first.samples)
+    assert denoiser.denoise_cache.stats()["hits"] == 1
+
+    other = AudioBuffer(upload.samples[::-1], upload.rate)
+    denoiser.denoise_buffer(other)
+    assert len(calls) == 2
@@ -0,0 +1,50 @@
+"""
+Local Hindi romanization used for F5-TTS.
+
+Run with: python -m pytest test_romanizer.py
+"""
+import os
+
+import pytest
+
+pytest.importorskip("indic_transliteration")
+pytest.importorskip("prometheus_client")
+
+# Offline backend, memory-only cache
+os.environ["HINDI_ROMANIZER"] = "local"
+os.environ["ROMANIZATION_CACHE_PATH"] = ""
+
+from pipeline.romanizer import DEVANAGARI, local_romanize, romanize_hindi  # noqa: E402
+
+
+@pytest.mark.parametrize("hindi, roman", [
+    ("ज्ञान", "gyaan"),
+    ("ऑफिस", "ofis"),
+    ("डॉक्टर", "doktar"),
+    ("ऑफिस डॉक्टर", "ofis doktar"),
+    ("फल", "phal"),
+    ("फ़ोन", "fon"),
+    ("कमल", "kamal"),
+    ("संगीत", "sangeet"),
+    ("नमस्ते दुनिया।", "namaste duniyaa."),
+])
+def test_local_romanize(hindi, roman):
+    assert local_romanize(hindi) == roman
+
+
+def test_mixed_english_keeps_its_spelling():
+    assert local_romanize("हिंदी में Hello") == "hindee men hello"
+
+
+def test_no_devanagari_reaches_tts():
+    # Signs ITRANS has no letters for are dropped rather than passed through
+    text = "ऑफिस में ॐ ज्ञान ऍप ॲ"
+    assert DEVANAGARI.search(romanize_hindi(text)) is None
+
+
+def test_cache_entries_of_older_rules_are_not_served(monkeypatch):
+    from pipeline import romanizer
+
+    romanizer.romanization_cache.put(f"local-v{romanizer.ROMANIZER_VERSION}\x1fज्ञान", "jnaan")
+    monkeypatch.setattr(romanizer, "ROMANIZER_VERSION", romanizer.ROMANIZER_VERSION + 1)
+    assert romanizer.romanize_many(["ज्ञान"]) == ["gyaan"]
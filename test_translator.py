@@ -0,0 +1,113 @@
+"""
+NLLB micro-batcher: result ordering and per-request error propagation.
+
+The model calls (_encode, _generate) are replaced with a character-level
+fake, so these tests exercise only the batching logic.
+
+Run with: python -m pytest test_translator.py
+"""
+import os
+import threading
+
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+pytest.importorskip("prometheus_client")
+
+# Memory-only translation cache
+os.environ["TRANSLATION_CACHE_PATH"] = ""
+
+from pipeline import translator  # noqa: E402
+from pipeline.translator import BatchingTranslator  # noqa: E402
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    """Tokens are characters; a translation is the text upper-cased and tagged with the target"""
+    calls = []
+    lock = threading.Lock()
+
+    def encode(texts, source_lang):
+        if source_lang == "bad_Lang":
+            raise ValueError("unknown source language")
+        return [[ord(char) for char in text] for text in texts]
+
+    def generate(input_ids, target_lang):
+        texts = ["".join(map(chr, ids)) for ids in input_ids]
+        with lock:
+            calls.append(texts)
+        if any("boom" in text for text in texts):
+            raise RuntimeError("generate failed")
+        return [f"{text.upper()}@{target_lang}" for text in texts]
+
+    monkeypatch.setattr(translator, "_encode", encode)
+    monkeypatch.setattr(translator, "_generate", generate)
+    return calls
+
+
+def test_results_follow_submission_order(fake_model):
+    batcher = BatchingTranslator(max_batch=3, max_wait_ms=50, max_batch_tokens=40)
+    texts = ["a" * length for length in (9, 1, 14, 3, 3, 7, 12, 2, 5)]
+    texts = [f"{i}{text}" for i, text in enumerate(texts)]
+
+    results = batcher.translate_many(texts, "eng_Latn", "fra_Latn")
+
+    assert results == [f"{text.upper()}@fra_Latn" for text in texts]
+    # Packing stays within the count and padded-token limits
+    assert len(fake_model) > 1
+    for batch in fake_model:
+        assert len(batch) <= 3
+        assert len(batch) == 1 or len(batch) * max(map(len, batch)) <= 40
+
+
+def test_language_pairs_are_batched_separately(fake_model):
+    batcher = BatchingTranslator(max_batch=8, max_wait_ms=50)
+    requests = [("one", "fra_Latn"), ("two", "deu_Latn"), ("three", "fra_Latn"), ("four", "deu_Latn")]
+
+    futures = [batcher.submit(text, "eng_Latn", target) for text, target in requests]
+
+    assert [future.result(timeout=5) for future in futures] == [
+        f"{text.upper()}@{target}" for text, target in requests
+    ]
+    for batch in fake_model:
+        assert len({text in ("one", "three") for text in batch}) == 1
+
+
+def test_failed_generate_fails_only_its_batch(fake_model):
+    batcher = BatchingTranslator(max_batch=1, max_wait_ms=50)
+    futures = [batcher.submit(text, "eng_Latn", "fra_Latn") for text in ("fine", "boom", "also fine")]
+
+    assert futures[0].result(timeout=5) == "FINE@fra_Latn"
+    with pytest.raises(RuntimeError, match="generate failed"):
+        futures[1].result(timeout=5)
+    assert futures[2].result(timeout=5) == "ALSO FINE@fra_Latn"
+
+
+def test_failed_encode_fails_only_its_language_pair(fake_model):
+    batcher = BatchingTranslator(max_batch=8, max_wait_ms=50)
+    bad = batcher.submit("text", "bad_Lang", "fra_Latn")
+    good = batcher.submit("text", "eng_Latn", "fra_Latn")
+
+    assert good.result(timeout=5) == "TEXT@fra_Latn"
+    with pytest.raises(ValueError, match="unknown source language"):
+        bad.result(timeout=5)
+
+
+def test_worker_survives_a_failed_round(fake_model, monkeypatch):
+    batcher = BatchingTranslator(max_batch=8, max_wait_ms=10)
+    translate_round = batcher._translate_round
+    rounds = []
+
+    def flaky_round(pending):
+        rounds.append(len(pending))
+        if len(rounds) == 1:
+            raise RuntimeError("round failed")
+        translate_round(pending)
+
+    monkeypatch.setattr(batcher, "_translate_round", flaky_round)
+
+    with pytest.raises(RuntimeError, match="round failed"):
+        batcher.submit("first", "eng_Latn", "fra_Latn").result(timeout=5)
+    assert batcher.submit("second", "eng_Latn", "fra_Latn").result(timeout=5) == "SECOND@fra_Latn"
+    assert batcher._worker.is_alive()
@@ -0,0 +1,71 @@
+"""
+Vectorized silence detection against pydub's reference implementation.
+
+Run with: python -m pytest test_utils.py
+"""
+import numpy as np
+import pytest
+
+pytest.importorskip("pydub")
+
+from pydub import AudioSegment, silence  # noqa: E402
+
+from pipeline.utils import SAMPLE_DTYPES, detect_silence_ranges, join_ranges, split_ranges_on_silence  # noqa: E402
+
+
+def bursts(sample_width=2, channels=1, frame_rate=8000, seed=0):
+    """About 3 s of tone bursts separated by silent and near-silent gaps of varying length"""
+    rng = np.random.default_rng(seed)
+    dtype = SAMPLE_DTYPES[sample_width]
+    peak = np.iinfo(dtype).max
+    pieces = []
+    for ms in (120, 40, 300, 700, 250, 90, 400, 1000):
+        frames = frame_rate * ms // 1000
+        t = np.arange(frames) / frame_rate
+        pieces.append(0.6 * np.sin(2 * np.pi * rng.uniform(150, 900) * t))
+        # Gaps alternate between true silence and low hiss
+        gap = frame_rate * int(rng.integers(50, 900)) // 1000
+        pieces.append(rng.normal(0, 0.002 * (len(pieces) % 4), gap))
+    mono = np.concatenate(pieces)
+    samples = np.repeat(mono[:, None], channels, axis=1) * np.linspace(1, 0.7, channels)
+    data = np.clip(samples * peak, -peak, peak).astype(dtype)
+    return AudioSegment(data.tobytes(), frame_rate=frame_rate, sample_width=sample_width, channels=channels)
+
+
+@pytest.mark.parametrize("sample_width, channels, frame_rate", [
+    (2, 1, 8000),
+    (2, 2, 16000),
+    (1, 1, 11025),
+    (4, 2, 8000),
+])
+@pytest.mark.parametrize("min_silence_len, silence_thresh, seek_step", [
+    (100, -40, 1),
+    (500, -30, 1),
+    (250, -50, 10),
+    (300, -20, 7),
+])
+def test_detect_silence_matches_pydub(sample_width, channels, frame_rate, min_silence_len, silence_thresh, seek_step):
+    audio = bursts(sample_width, channels, frame_rate)
+    expected = silence.detect_silence(audio, min_silence_len, silence_thresh, seek_step)
+    assert detect_silence_ranges(audio, min_silence_len, silence_thresh, seek_step) == expected
+
+
+@pytest.mark.parametrize("audio, min_silence_len", [
+    (AudioSegment.silent(duration=1200, frame_rate=8000), 500),
+    (AudioSegment.silent(duration=300, frame_rate=8000), 500),
+    (bursts()[:700], 100),
+])
+def test_edge_cases_match_pydub(audio, min_silence_len):
+    expected = silence.detect_silence(audio, min_silence_len, -40)
+    assert detect_silence_ranges(audio, min_silence_len, -40) == expected
+
+
+@pytest.mark.parametrize("keep_silence", [0, 100, True])
+def test_split_and_join_match_split_on_silence(keep_silence):
+    audio = bursts(channels=2)
+    thresh = audio.dBFS - 16
+    chunks = silence.split_on_silence(audio, min_silence_len=200, silence_thresh=thresh, keep_silence=keep_silence)
+    ranges = split_ranges_on_silence(audio, min_silence_len=200, silence_thresh=thresh, keep_silence=keep_silence)
+
+    assert [len(chunk) for chunk in chunks] == [end - start for start, end in ranges]
+    assert join_ranges(audio, ranges).raw_data == sum(chunks, AudioSegment.empty()).raw_data